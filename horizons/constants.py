@@ -19,22 +19,125 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
-import ctypes
+import fnmatch
 import os
 import os.path
 import platform
+import re
 import subprocess
+import zlib
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional
 
 from horizons.ext.enum import Enum
 
-
 """This file keeps track of the constants that are used in Unknown Horizons.
 NOTE: Using magic constants in code is generally a bad style, so avoid where
 possible and instead import the proper classes of this file.
 """
 
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Release tags look like 2017.2, the glob pattern is translated to a regular expression once.
+_GIT_TAG_STRUCTURE = re.compile(fnmatch.translate("20[0-9][0-9].[0-9]*"))
+
+
+def _read_git_file_line(path):
+	"""Returns the first line of a file in .git, without surrounding whitespace."""
+	with open(path, 'rb') as f:
+		return f.readline().strip().decode('utf-8')
+
+
+def _read_packed_git_refs(git_dir):
+	"""Returns a list of (sha1, refname, peeled) tuples found in .git/packed-refs.
+	Annotated tags are peeled, i.e. their sha1 is the one of the tagged commit.
+	peeled is False for tags if git didn't record whether they are annotated.
+	"""
+	refs = []
+	packed_refs_path = Path(git_dir, 'packed-refs')
+	if not packed_refs_path.exists():
+		return refs
+	tags_peeled = False
+	with packed_refs_path.open('rb') as f:
+		for line in f:
+			line = line.strip().decode('utf-8')
+			if line.startswith('# pack-refs with:'):
+				traits = line[len('# pack-refs with:'):].split()
+				tags_peeled = 'peeled' in traits or 'fully-peeled' in traits
+			if not line or line.startswith('#'):
+				continue
+			if line.startswith('^'):
+				# peeled line, belongs to the annotated tag in the previous line
+				refs[-1] = (line[1:], refs[-1][1], True)
+			else:
+				sha, _, refname = line.partition(' ')
+				refs.append((sha, refname, tags_peeled or not refname.startswith('refs/tags/')))
+	return refs
+
+
+def _peel_loose_git_object(git_dir, sha):
+	"""Returns the sha1 of the object an annotated tag points to, or `sha` itself
+	if it isn't a tag. Returns None if the object is not stored as loose object.
+	"""
+	object_path = Path(git_dir, 'objects', sha[:2], sha[2:])
+	if not object_path.exists():
+		return None
+	with object_path.open('rb') as f:
+		data = zlib.decompress(f.read())
+	header, _, body = data.partition(b'\0')
+	if not header.startswith(b'tag '):
+		return sha
+	# the first line of a tag object is "object <sha1>"
+	return body.split(b'\n', 1)[0].split(b' ')[1].decode('ascii')
+
+
+def _read_git_head(git_dir):
+	"""Returns the sha1 of the commit HEAD points to, or None."""
+	git_head_path = Path(git_dir, 'HEAD')
+	if not git_head_path.exists():
+		return None
+	head = _read_git_file_line(git_head_path)
+	if not head.startswith('ref: '):
+		return head # detached HEAD
+
+	ref = head[len('ref: '):]
+	ref_path = Path(git_dir, ref)
+	if ref_path.exists():
+		return _read_git_file_line(ref_path)
+	for sha, refname, peeled in _read_packed_git_refs(git_dir):
+		if refname == ref:
+			return sha
+	return None
+
+
+def _find_git_tag(git_dir, sha):
+	"""Returns the name of the release tag pointing at commit `sha`, or None.
+	None is returned as well if several release tags point there, or if a tag
+	can't be resolved without git. In these cases git describe has to decide.
+	"""
+	tags = {} # name => (sha1, peeled)
+	for refsha, refname, peeled in _read_packed_git_refs(git_dir):
+		if refname.startswith('refs/tags/'):
+			tags[refname[len('refs/tags/'):]] = (refsha, peeled)
+	tags_dir = Path(git_dir, 'refs', 'tags')
+	if tags_dir.is_dir():
+		# loose refs take precedence over packed ones and are never peeled
+		for tag_path in tags_dir.iterdir():
+			tags[tag_path.name] = (_read_git_file_line(tag_path), False)
+
+	matches = []
+	for tag, (refsha, peeled) in tags.items():
+		if not _GIT_TAG_STRUCTURE.match(tag):
+			continue
+		if not peeled and refsha != sha:
+			refsha = _peel_loose_git_object(git_dir, refsha)
+			if refsha is None:
+				return None
+		if refsha == sha:
+			matches.append(tag)
+	return matches[0] if len(matches) == 1 else None
+
+
 def get_git_version():
 	"""Function gets latest revision of the working copy.
 	It only works in git repositories, and is actually a hack.
@@ -42,55 +145,67 @@ def get_git_version():
 	try:
 		from run_uh import get_content_dir_parent_path
 		uh_path = get_content_dir_parent_path()
-	except ImportError:
+	except (ImportError, RuntimeError):
 		return "<unknown>"
 
-	# Try git describe
+	# Read current HEAD out of .git manually. If it is exactly on a release tag,
+	# that tag is what git describe would print, so we don't need to spawn git
+	head = None
+	git_dir = Path(uh_path, '.git')
+	if git_dir.is_dir():
+		try:
+			head = _read_git_head(git_dir)
+			if head:
+				tag = _find_git_tag(git_dir, head)
+				if tag:
+					return tag
+		except (IOError, IndexError, UnicodeDecodeError, zlib.error):
+			pass
+
+	# Try git describe, this adds the distance to the last tag (e.g. 2017.3-1-g9eab47c)
 	try:
-		git = "git"
-		if platform.system() == "Windows":
-			git = "git.exe"
+		git = "git.exe" if _IS_WINDOWS else "git"
 
-		# Note that this uses glob patterns, not regular expressions.
-		# TAG_STRUCTURE = "20[0-9][0-9].[0-9]*"
-		# describe = [git, "describe", "--tags", TAG_STRUCTURE]
 		describe = [git, "describe", "--tags"]
 		git_string = subprocess.check_output(describe, cwd=uh_path, universal_newlines=True).rstrip('\n')
 		return git_string
-	except (subprocess.CalledProcessError, RuntimeError):
+	except (subprocess.CalledProcessError, OSError):
 		pass
 
-	# Read current HEAD out of .git manually
-	try:
-		git_head_path = Path(uh_path, '.git', 'HEAD')
-		if git_head_path.exists():
-			with git_head_path.open() as f:
-				head = f.readline().strip().partition(' ')
-			if head[2]:
-				head_file = Path(uh_path, '.git', head[2])
-			else:
-				head_file = git_head_path
-
-			if head_file.exists():
-				with head_file.open() as f:
-					return str(f.readline().strip()[0:7])
-	except ImportError:
-		pass
+	# Use the short sha of HEAD if git itself is not available
+	if head:
+		return head[0:7]
 
 	# Try gitversion.txt
 	try:
-		with open(os.path.join("content", "packages", "gitversion.txt")) as f:
-			return f.read()
+		with open(os.path.join("content", "packages", "gitversion.txt"), 'rb') as f:
+			return f.read().decode('utf-8')
 	except IOError:
 		pass
 
 	return "<unknown>"
 
 
+class _LazyGitVersion:
+	"""Descriptor that calls get_git_version() on first access only.
+	The result then replaces the descriptor on the owning class.
+	"""
+	def __init__(self, name):
+		# type: (str) -> None
+		# the attribute name this is assigned to, __set_name__ needs python 3.6
+		self.name = name
+
+	def __get__(self, instance, owner):
+		# type: (object, type) -> str
+		version = get_git_version()
+		setattr(owner, self.name, version)
+		return version
+
+
 ##Versioning
 class VERSION:
 	RELEASE_NAME    = "Unknown Horizons %s"
-	RELEASE_VERSION = get_git_version()
+	RELEASE_VERSION = _LazyGitVersion('RELEASE_VERSION')
 	# change for release:
 	IS_DEV_VERSION = True
 	#RELEASE_VERSION = u'2017.2'
@@ -105,9 +220,14 @@ class VERSION:
 	SAVEGAMEREVISION = 76
 	SAVEGAME_LEAST_UPGRADABLE_REVISION = 48
 
-	@staticmethod
-	def string():
-		return VERSION.RELEASE_NAME % VERSION.RELEASE_VERSION
+	_string = None # type: Optional[str]
+
+	@classmethod
+	def string(cls):
+		# the release version can't change once resolved, so format it only once
+		if cls._string is None:
+			cls._string = cls.RELEASE_NAME % cls.RELEASE_VERSION
+		return cls._string
 
 ## WORLD
 class UNITS:
@@ -214,26 +334,26 @@ class BUILDINGS:
 
 	BARRIER	         = 71
 
-	EXPAND_RANGE = (WAREHOUSE, STORAGE, LOOKOUT)
+	EXPAND_RANGE = frozenset((WAREHOUSE, STORAGE, LOOKOUT))
 
 	TRANSPARENCY_VALUE = 180
 
 	class ACTION:
 		# data for calculating gfx for paths.
 		# think: animation contains key, if there is a path at offset value
-		# you need to sort this before iterating via sorted, since order is important here.
-		action_offset_dict = {
+		# this is sorted by key, since order is important here.
+		action_offsets = (
 		# Direct connections
-		  'a' : ( 0, -1),
-		  'b' : (+1,  0),
-		  'c' : ( 0, +1),
-		  'd' : (-1,  0),
+		  ('a', ( 0, -1)),
+		  ('b', (+1,  0)),
+		  ('c', ( 0, +1)),
+		  ('d', (-1,  0)),
 		# Remote connections
-		  'e' : (+1, -1),
-		  'f' : (+1, +1),
-		  'g' : (-1, +1),
-		  'h' : (-1, -1),
-		}
+		  ('e', (+1, -1)),
+		  ('f', (+1, +1)),
+		  ('g', (-1, +1)),
+		  ('h', (-1, -1)),
+		)
 
 	class BUILD:
 		MAX_BUILDING_SHIP_DISTANCE = 5 # max distance ship-building when building from ship
@@ -402,9 +522,8 @@ class ACTION_SETS:
 
 class GAME_SPEED:
 	TICKS_PER_SECOND = 16
-	TICK_RATES = [] # type: List[int]
-
-GAME_SPEED.TICK_RATES = [int(i * GAME_SPEED.TICKS_PER_SECOND) for i in (0.5, 1, 2, 3, 4, 6, 8, 11, 20)]
+	# TICKS_PER_SECOND times (0.5, 1, 2, 3, 4, 6, 8, 11, 20)
+	TICK_RATES = (8, 16, 32, 48, 64, 96, 128, 176, 320)
 
 class COLORS:
 	BLACK = 9
@@ -545,9 +664,11 @@ if 'UH_USER_DIR' in os.environ:
 	# Prefer the value from the environment. Used to override user dir when
 	# running GUI tests.
 	_user_dir = os.environ['UH_USER_DIR']
-elif platform.system() != "Windows":
-	_user_dir = os.path.join(os.path.expanduser('~'), '.unknown-horizons')
+elif not _IS_WINDOWS:
+	_home_dir = os.path.expanduser('~')
+	_user_dir = os.path.join(_home_dir, '.unknown-horizons')
 else:
+	import ctypes
 	import ctypes.wintypes
 	buf = ctypes.create_unicode_buffer(ctypes.wintypes.MAX_PATH)
 	# get the My Documents folder into buf.value
@@ -596,17 +717,15 @@ class PATHS:
 	CONFIG_TEMPLATE_FILE = os.path.join("content", "settings-template.xml")
 
 
-	DB_FILES = tuple(os.path.join("content", i) for i in
-	                 ("game.sql", "balance.sql", "names.sql"))
+	DB_FILES = ("content/game.sql", "content/balance.sql", "content/names.sql")
 
-	ATLAS_SOURCE_DIRECTORIES = tuple(os.path.join("content/gfx", d)
-	                                 for d in (
-	                                 "/base",
-	                                 "/buildings",
-	                                 "/misc",
-	                                 "/terrain",
-	                                 "/units",
-	                                ))
+	ATLAS_SOURCE_DIRECTORIES = (
+		"content/gfx/base",
+		"content/gfx/buildings",
+		"content/gfx/misc",
+		"content/gfx/terrain",
+		"content/gfx/units",
+	)
 
 	#voice paths
 	VOICE_DIR = os.path.join("content", "audio", "voice")
@@ -640,6 +759,18 @@ class NETWORK:
 
 ## TRANSLATIONS
 class _LanguageNameDict(dict):
+	"""Maps language codes to (own name, english name) tuples.
+	Reverse lookups by name use indexes built on creation, so the
+	dict must not be changed afterwards.
+	"""
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self._by_own_name = {}
+		self._by_english_name = {}
+		for code, (own, eng) in self.items():
+			self._by_own_name.setdefault(own, code)
+			self._by_english_name.setdefault(eng, code)
+
 	def __getitem__(self, key):
 		return self.get(key, [key])[0]
 
@@ -647,12 +778,8 @@ class _LanguageNameDict(dict):
 		return self.get(key, [key])[1]
 
 	def get_by_value(self, value, english=False):
-		for code, (own, eng) in self.items():
-			if english and eng == value:
-				return code
-			elif not english and own == value:
-				return code
-		return "" # meaning default key
+		names = self._by_english_name if english else self._by_own_name
+		return names.get(value, "") # "" meaning default key
 
 
 LANGUAGENAMES = _LanguageNameDict({
@@ -704,49 +831,50 @@ LANGUAGENAMES = _LanguageNameDict({
 	"zu"    : ('IsiZulu', 'Zulu'),
 })
 
-FONTDEFS = {
+# Locales that are displayed with the libertine font, all others use unifont.
+LIBERTINE_LOCALES = frozenset({
 	# "af"
-	"bg"    : 'libertine',
+	"bg",
 	# "ca"
-	"ca@valencia" : 'libertine',
-	"cs"    : 'libertine',
-	"da"    : 'libertine',
-	"de"    : 'libertine',
-	"en"    : 'libertine',
-	"es"    : 'libertine',
-	"et"    : 'libertine',
-	"el"    : 'libertine',
-	"fi"    : 'libertine',
-	"fr"    : 'libertine',
-	"ga"    : 'libertine',
-	"gl"    : 'libertine',
+	"ca@valencia",
+	"cs",
+	"da",
+	"de",
+	"en",
+	"es",
+	"et",
+	"el",
+	"fi",
+	"fr",
+	"ga",
+	"gl",
 	# "hi"
-	"hr"    : 'libertine',
-	"hu"    : 'libertine',
-	"id"    : 'libertine',
-	"it"    : 'libertine',
+	"hr",
+	"hu",
+	"id",
+	"it",
 	# "ja"
-	"lt"    : 'libertine',
-	"lv"    : 'libertine',
+	"lt",
+	"lv",
 	# "ko"
-	"nb"    : 'libertine',
-	"nl"    : 'libertine',
-	"pl"    : 'libertine',
-	"pt_BR" : 'libertine',
-	"pt"    : 'libertine',
-	"ro"    : 'libertine',
-	"ru"    : 'libertine',
-	"sk"    : 'libertine',
-	"sl"    : 'libertine',
-	"sr"    : 'libertine',
-	"sv"    : 'libertine',
+	"nb",
+	"nl",
+	"pl",
+	"pt_BR",
+	"pt",
+	"ro",
+	"ru",
+	"sk",
+	"sl",
+	"sr",
+	"sv",
 	# "th"
-	"tr"    : 'libertine',
-	"uk"    : 'libertine',
+	"tr",
+	"uk",
 	# "vi"
 	# "zh_CN"
-	"zu"    : 'libertine',
-}
+	"zu",
+})
 
 class HOTKEYS:
 	DISPLAY_KEY = {
@@ -21,6 +21,7 @@
 
 import functools
 import logging
+from collections import namedtuple
 
 from fife import fife
 
@@ -35,6 +36,9 @@ from horizons.i18n import gettext as T
 from horizons.util.python.callback import Callback
 from horizons.util.worldobject import WorldObject
 
+# child widgets of a trade slot, looked up once when the slot is created
+SlotChildren = namedtuple('SlotChildren', ['button', 'buysell', 'icon', 'amount', 'fillbar', 'slider'])
+
 
 class BuySellTab(TabInterface):
 	"""
@@ -67,19 +71,23 @@ class BuySellTab(TabInterface):
 
 		# add the buy/sell slot widgets
 		self.slot_widgets = {}
+		self.slot_children = {} # {slot_id: SlotChildren}
 		self.resources = None # Placeholder for resource gui
 		self.add_slots(len(self.trade_post.slots))
 
-		for slot_id in range(len(self.trade_post.slots)):
-			if self.trade_post.slots[slot_id] is not None:
-				trade_slot_info = self.trade_post.slots[slot_id]
-				self.slot_widgets[slot_id].action = 'sell' if trade_slot_info.selling else 'buy'
-				self.add_resource(trade_slot_info.resource_id, slot_id, trade_slot_info.limit)
-
-				if trade_slot_info.selling:
-					self._show_sell(self.slot_widgets[slot_id])
-				else:
-					self._show_buy(self.slot_widgets[slot_id])
+		trade_slots = [(slot_id, trade_slot_info)
+		               for slot_id, trade_slot_info in enumerate(self.trade_post.slots)
+		               if trade_slot_info is not None]
+		for slot_id, trade_slot_info in trade_slots:
+			self.slot_widgets[slot_id].action = 'sell' if trade_slot_info.selling else 'buy'
+		self.add_resources([(trade_slot_info.resource_id, slot_id, trade_slot_info.limit)
+		                    for slot_id, trade_slot_info in trade_slots])
+
+		for slot_id, trade_slot_info in trade_slots:
+			if trade_slot_info.selling:
+				self._show_sell(slot_id)
+			else:
+				self._show_buy(slot_id)
 
 		# init the trade history
 		self.trade_history = self.widget.findChild(name='trade_history')
@@ -140,33 +148,49 @@ class BuySellTab(TabInterface):
 		@param amount: number of slot widgets that are to be added.
 		"""
 		content = self.widget.findChild(name="content")
+		slots = []
 		for i in range(amount):
+			# The xml source is read from disk only once (see get_widget_xml), only
+			# parsing happens per slot. Widgets wrap guichan objects and can't be copied.
 			slot = load_uh_widget('trade_single_slot.xml')
 			self.slot_widgets[i] = slot
 			slot.id = i
 			slot.action = 'buy'
 			slot.res = None
 			slot.name = "slot_%d" % i
-			slot.findChild(name='button').capture(self.handle_click, event_name='mouseClicked')
-			slot.findChild(name='button').path = self.dummy_icon_path
-			slider = slot.findChild(name="slider")
+			children = SlotChildren(*(slot.findChild(name=name) for name in SlotChildren._fields))
+			self.slot_children[i] = children
+			children.button.capture(self.handle_click, event_name='mouseClicked')
+			children.button.path = self.dummy_icon_path
+			slider = children.slider
 			slider.scale_start = 0.0
 			slider.scale_end = float(self.trade_post.get_inventory().limit)
 			# Set scale according to the settlement inventory size
-			slot.findChild(name="buysell").capture(Callback(self.toggle_buysell, i))
-			fillbar = slot.findChild(name="fillbar")
+			children.buysell.capture(Callback(self.toggle_buysell, i))
 			# hide fillbar by setting position
-			icon = slot.findChild(name="icon")
+			fillbar, icon = children.fillbar, children.icon
 			fillbar.position = (icon.width - fillbar.width - 1, icon.height)
-			content.addChild(slot)
+			slots.append(slot)
+		content.addChildren(slots)
 		self.widget.adaptLayout()
 
 
-	def add_resource(self, resource_id, slot_id, value=None):
+	def add_resources(self, resources):
+		"""
+		Adds several resources to their slots. The resource names are
+		fetched from the db with a single query for all slots.
+		@param resources: list of (resource_id, slot_id, value) tuples
+		"""
+		res_names = self.session.db.get_res_names(res_id for res_id, _, _ in resources if res_id != 0)
+		for resource_id, slot_id, value in resources:
+			self.add_resource(resource_id, slot_id, value, res_name=res_names.get(resource_id))
+
+	def add_resource(self, resource_id, slot_id, value=None, res_name=None):
 		"""
 		Adds a resource to the specified slot
 		@param resource_id: int - resource id
 		@param slot_id: int - slot number of the slot that is to be set
+		@param res_name: translated resource name, looked up if not provided
 		"""
 		self.log.debug("BuySellTab add_resource() resid: %s; slot_id %s; value: %s", resource_id, slot_id, value)
 
@@ -180,7 +204,8 @@ class BuySellTab(TabInterface):
 				self._set_hint("")
 			keep_hint = True
 		slot = self.slot_widgets[slot_id]
-		slider = slot.findChild(name="slider")
+		children = self.slot_children[slot_id]
+		slider = children.slider
 
 		if value is None: # use current slider value if player provided no input
 			value = int(slider.value)
@@ -198,20 +223,20 @@ class BuySellTab(TabInterface):
 			if resource_id != 0:
 				self.set_slot_info(slot.id, resource_id, False, value)
 
-		button = slot.findChild(name="button")
-		fillbar = slot.findChild(name="fillbar")
+		button = children.button
+		fillbar = children.fillbar
 		# reset slot value for new res
 		if resource_id == 0:
 			button.path = self.dummy_icon_path
 			button.helptext = ""
-			slot.findChild(name="amount").text = ""
-			slot.findChild(name="slider").value = 0.0
+			children.amount.text = ""
+			slider.value = 0.0
 			slot.res = None
 			slider.capture(None)
 			# hide fillbar by setting position
-			icon = slot.findChild(name="icon")
+			icon = children.icon
 			fillbar.position = (icon.width - fillbar.width - 1, icon.height)
-			button = slot.findChild(name="buysell")
+			button = children.buysell
 			button.up_image = None
 			button.hover_image = None
 		else:
@@ -220,13 +245,15 @@ class BuySellTab(TabInterface):
 			button.up_image = icon
 			button.down_image = icon
 			button.hover_image = icon_disabled
-			button.helptext = self.session.db.get_res_name(resource_id)
+			if res_name is None:
+				res_name = self.session.db.get_res_name(resource_id)
+			button.helptext = res_name
 			slot.res = resource_id
 			# use some python magic to assign a res attribute to the slot to
 			# save which resource_id it stores
 			slider.capture(Callback(self.slider_adjust, resource_id, slot.id))
-			slot.findChild(name="amount").text = "{amount:-5d}t".format(amount=value)
-			icon = slot.findChild(name="icon")
+			children.amount.text = "{amount:-5d}t".format(amount=value)
+			icon = children.icon
 			inventory = self.trade_post.get_inventory()
 			filled = (100 * inventory[resource_id]) // inventory.get_limit(resource_id)
 			fillbar.position = (icon.width - fillbar.width - 1,
@@ -239,14 +266,14 @@ class BuySellTab(TabInterface):
 	def toggle_buysell(self, slot_id, keep_hint=False):
 		"""Switches modes of individual resource slots between 'buy' and 'sell'."""
 		slot_widget = self.slot_widgets[slot_id]
-		limit = int(slot_widget.findChild(name="slider").value)
+		limit = int(self.slot_children[slot_id].slider.value)
 		if slot_widget.action == "buy":
 			# setting to sell
-			self._show_sell(slot_widget)
+			self._show_sell(slot_id)
 			slot_widget.action = "sell"
 		elif slot_widget.action == "sell":
 			# setting to buy
-			self._show_buy(slot_widget)
+			self._show_buy(slot_id)
 			slot_widget.action = "buy"
 
 		if slot_widget.res is not None:
@@ -270,10 +297,10 @@ class BuySellTab(TabInterface):
 
 	def slider_adjust(self, resource_id, slot_id):
 		"""Couples the displayed limit of this slot to the slider position."""
-		slider = self.slot_widgets[slot_id].findChild(name="slider")
-		limit = int(slider.value)
+		children = self.slot_children[slot_id]
+		limit = int(children.slider.value)
 		self.set_slot_info(slot_id, resource_id, self.slot_widgets[slot_id].action == "sell", limit)
-		self.slot_widgets[slot_id].findChild(name="amount").text = "{amount:-5d}t".format(amount=limit)
+		children.amount.text = "{amount:-5d}t".format(amount=limit)
 		self.slot_widgets[slot_id].adaptLayout()
 		self._update_hint(slot_id)
 
@@ -315,7 +342,7 @@ class BuySellTab(TabInterface):
 	def _update_hint(self, slot_id):
 		"""Sets default hint for last updated slot"""
 		slot_widget = self.slot_widgets[slot_id]
-		limit = int(slot_widget.findChild(name="slider").value)
+		limit = int(self.slot_children[slot_id].slider.value)
 		action = slot_widget.action
 		price = self.session.db.get_res_value(slot_widget.res)
 		if action == "buy":
@@ -336,14 +363,14 @@ class BuySellTab(TabInterface):
 		lbl.text = text
 		lbl.adaptLayout()
 
-	def _show_buy(self, slot):
+	def _show_buy(self, slot_id):
 		"""Make slot show buy button. Purely visual change"""
-		button = slot.findChild(name="buysell")
+		button = self.slot_children[slot_id].buysell
 		button.up_image = self.buy_button_path
 		button.helptext = T("Buying")
 
-	def _show_sell(self, slot):
+	def _show_sell(self, slot_id):
 		"""Make slot show sell button. Purely visual change"""
-		button = slot.findChild(name="buysell")
+		button = self.slot_children[slot_id].buysell
 		button.up_image = self.sell_button_path
 		button.helptext = T("Selling")
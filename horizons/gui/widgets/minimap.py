@@ -31,6 +31,7 @@ from horizons.command.unit import Act
 from horizons.component.namedcomponent import NamedComponent
 from horizons.extscheduler import ExtScheduler
 from horizons.messaging import SettingChanged
+from horizons.util.python.decorators import cachedfunction
 from horizons.util.shapes import Circle, Point, Rect
 
 
@@ -43,18 +44,12 @@ def get_world_to_minimap_ratio(world_dimensions, minimap_dimensions):
 	return tuple(w / m for w, m in zip(world_dimensions, minimap_dimensions))
 
 
-def iter_minimap_points(location, world, island_color, water_color, area=None):
-	"""Return an iterator over the pixels of a minimap of the given world.
+def _get_real_map_coords(location, world, area):
+	"""Return the pixel columns and rows of `area` together with the real map
+	coordinates they cover, as tuples of (x, real_map_x) and (y, real_map_y).
 
-	For every pixel, a tuple ((x, y), (r, g, b)) is returned. These are the x and y
-	coordinated and the color of the pixel in RGB.
-
-	If `area` is set, it's supposed to be a part of `location`, that is to be
-	returned.
+	The pixel coordinates assume (0, 0) to be the origin of `location`.
 	"""
-	if area is None:
-		area = location
-
 	# calculate which area of the real map is mapped to which pixel on the minimap
 	world_dimensions = (world.map_dimensions.width, world.map_dimensions.height)
 	minimap_dimensions = (location.width, location.height)
@@ -66,30 +61,53 @@ def iter_minimap_points(location, world, island_color, water_color, area=None):
 
 	world_min_x = world.min_x
 	world_min_y = world.min_y
-	full_map = world.full_map
 
 	# loop through map coordinates, assuming (0, 0) is the origin of the minimap
 	# this facilitates calculating the real world coords
-	for x in range(area.left - location.left, area.left + area.width - location.left):
-		for y in range(area.top - location.top, area.top + area.height - location.top):
-			"""
-			This code should be here, but since python can't do inlining, we have to inline
-			ourselves for performance reasons
-			covered_area = Rect.init_from_topleft_and_size(
-			  int(x * pixel_per_coord_x)+world_min_x,
-			  int(y * pixel_per_coord_y)+world_min_y),
-			  int(pixel_per_coord_x), int(pixel_per_coord_y))
-			real_map_point = covered_area.center
-			"""
-			# use center of the rect that the pixel covers
-			real_map_x = int(x * pixel_per_coord_x) + world_min_x + pixel_per_coord_x_half_as_int
-			real_map_y = int(y * pixel_per_coord_y) + world_min_y + pixel_per_coord_y_half_as_int
+	x_range = range(area.left - location.left, area.left + area.width - location.left)
+	y_range = range(area.top - location.top, area.top + area.height - location.top)
+
+	"""
+	This code should be in the loop, but since python can't do inlining, we have to inline
+	ourselves for performance reasons
+	covered_area = Rect.init_from_topleft_and_size(
+	  int(x * pixel_per_coord_x)+world_min_x,
+	  int(y * pixel_per_coord_y)+world_min_y),
+	  int(pixel_per_coord_x), int(pixel_per_coord_y))
+	real_map_point = covered_area.center
+	"""
+	# use center of the rect that the pixel covers. The real map coordinates only depend
+	# on the column resp. row, so look them up instead of computing them for every pixel.
+	columns = tuple((x, int(x * pixel_per_coord_x) + world_min_x + pixel_per_coord_x_half_as_int)
+	                for x in x_range)
+	rows = tuple((y, int(y * pixel_per_coord_y) + world_min_y + pixel_per_coord_y_half_as_int)
+	             for y in y_range)
+	return columns, rows
+
+
+def iter_minimap_points(location, world, island_color, water_color, area=None):
+	"""Return an iterator over the pixels of a minimap of the given world.
+
+	For every pixel, a tuple ((x, y), (r, g, b)) is returned. These are the x and y
+	coordinated and the color of the pixel in RGB.
+
+	If `area` is set, it's supposed to be a part of `location`, that is to be
+	returned.
+	"""
+	if area is None:
+		area = location
+
+	columns, rows = _get_real_map_coords(location, world, area)
+	full_map = world.full_map
+
+	for x, real_map_x in columns:
+		for y, real_map_y in rows:
 			real_map_coords = (real_map_x, real_map_y)
 
 			# check what's at the covered_area
-			if real_map_coords in full_map:
+			tile = full_map.get(real_map_coords)
+			if tile is not None:
 				# this pixel is an island
-				tile = full_map[real_map_coords]
 				settlement = tile.settlement
 				if settlement is None:
 					# island without settlement
@@ -99,13 +117,20 @@ def iter_minimap_points(location, world, island_color, water_color, area=None):
 						color = island_color
 				else:
 					# pixel belongs to a player
-					color = settlement.owner.color.to_tuple()
+					color = settlement.owner.color.rgb_tuple
 			else:
 				color = water_color
 
 			yield ((x, y), color)
 
 
+@cachedfunction
+def _get_circle_border_offsets(radius):
+	"""Return the border coordinates of a circle around (0, 0) as tuple.
+	There are only a few different radii, so this is cached."""
+	return tuple(Circle(Point(0, 0), radius=radius).get_border_coordinates())
+
+
 class Minimap:
 	"""A basic minimap.
 
@@ -135,6 +160,18 @@ class Minimap:
 
 	SHIP_DOT_UPDATE_INTERVAL = 0.5 # seconds
 
+	# Lines of the 'flag' drawn over ships of regular players, as offsets to the ship
+	# position: (start, end, color). A color of None means the color of the owner.
+	SHIP_FLAG_LINES = (
+	  ((-5, -5), ( 0, -5), None),
+	  ((-6, -6), ( 0, -6), None),
+	  ((-4, -4), ( 0, -4), None),
+	  # black border around the flag
+	  ((-6, -7), ( 0, -7), (0, 0, 0)),
+	  ((-4, -3), ( 0, -4), (0, 0, 0)),
+	  ((-6, -7), (-4, -3), (0, 0, 0)),
+	)
+
 	# Alpha-ordering determines the order:
 	RENDER_NAMES = {
 	  "background" : "c",
@@ -201,6 +238,8 @@ class Minimap:
 		self._id = str(next(self.__class__.__minimap_id_counter)) # internal identifier, used for allocating resources
 
 		self._image_size_cache = {} # internal detail
+		self._last_settlements_version = None # world.settlements_version of the last warehouse update
+		self._rotated_pixel_cache = {} # {rotation: {(x, y): (rotated_x, rotated_y)}}
 
 		self.imagemanager = imagemanager
 
@@ -256,7 +295,7 @@ class Minimap:
 		else:
 			# attach image to pychan icon (recommended)
 			self.minimap_image.reset()
-			self.icon.image = fife.GuiImage(self.minimap_image.image)
+			self.icon.image = self.minimap_image.gui_image
 
 		self.update_cam()
 		self._recalculate()
@@ -270,7 +309,7 @@ class Minimap:
 		"""Display data from dump_data"""
 		# only icon mode for now
 		self.minimap_image.reset()
-		self.icon.image = fife.GuiImage(self.minimap_image.image)
+		self.icon.image = self.minimap_image.gui_image
 
 		self.minimap_image.set_drawing_enabled()
 		rt = self.minimap_image.rendertarget
@@ -294,32 +333,30 @@ class Minimap:
 			return # don't draw while loading
 		use_rotation = self._get_rotation_setting()
 		self.minimap_image.set_drawing_enabled()
-		self.minimap_image.rendertarget.removeAll(self._get_render_name("cam"))
+		rt = self.minimap_image.rendertarget
+		render_name = self._get_render_name("cam")
+		rt.removeAll(render_name)
 		# draw rect for current screen
 		displayed_area = self.view.get_displayed_area()
 		minimap_corners_as_point = []
-		for corner in displayed_area.get_corners():
+		world = self.world
+		min_x, max_x = world.min_x, world.max_x
+		min_y, max_y = world.min_y, world.max_y
+		for x, y in displayed_area.get_corners():
 			# check if the corners are outside of the screen
-			corner = list(corner)
-			if corner[0] > self.world.max_x:
-				corner[0] = self.world.max_x
-			if corner[0] < self.world.min_x:
-				corner[0] = self.world.min_x
-			if corner[1] > self.world.max_y:
-				corner[1] = self.world.max_y
-			if corner[1] < self.world.min_y:
-				corner[1] = self.world.min_y
-			corner = tuple(corner)
+			corner = (min(max(x, min_x), max_x), min(max(y, min_y), max_y))
 
 			coords = self._world_to_minimap(corner, use_rotation)
 			minimap_corners_as_point.append(fife.Point(coords[0], coords[1]))
 
 
-		for i in range(0, 4):
-			self.minimap_image.rendertarget.addLine(self._get_render_name("cam"),
-			                                        minimap_corners_as_point[i],
-			                                        minimap_corners_as_point[(i+1) % 4],
-			                                                         *self.COLORS["cam"])
+		# FIFE render targets only support filled quads, so draw the border line by line,
+		# connecting each corner to the next one
+		add_line = rt.addLine
+		cam_color = self.COLORS["cam"]
+		for start, end in zip(minimap_corners_as_point,
+		                      minimap_corners_as_point[1:] + minimap_corners_as_point[:1]):
+			add_line(render_name, start, end, *cam_color)
 
 	@classmethod
 	def update(cls, tup):
@@ -465,7 +502,8 @@ class Minimap:
 			i += 1
 			render_name = self._get_render_name("highlight")+str(tup)
 			self.minimap_image.set_drawing_enabled()
-			self.minimap_image.rendertarget.removeAll(render_name)
+			rt = self.minimap_image.rendertarget
+			rt.removeAll(render_name)
 			if i > STEPS:
 				if finish_callback:
 					finish_callback()
@@ -476,9 +514,12 @@ class Minimap:
 
 			radius = MIN_RAD + int((float(part) / (STEPS // 2)) * (MAX_RAD - MIN_RAD))
 
-			draw_point = self.minimap_image.rendertarget.addPoint
-			for x, y in Circle(Point(*tup), radius=radius).get_border_coordinates():
-				draw_point(render_name, fife.Point(x, y), *color)
+			draw_point = rt.addPoint
+			point = fife.Point(0, 0)
+			center_x, center_y = tup
+			for x_off, y_off in _get_circle_border_offsets(radius):
+				point.set(center_x + x_off, center_y + y_off)
+				draw_point(render_name, point, *color)
 
 			ExtScheduler().add_new_object(lambda : high(i), self, INTERVAL, loops=1)
 
@@ -494,35 +535,34 @@ class Minimap:
 		# the path always contains the full path, the unit might be somewhere in it
 		position_of_unit_in_path = 0
 		unit_pos = unit.position.to_tuple()
-		for i, pos in enumerate(path):
-			if pos == unit_pos:
-				position_of_unit_in_path = i
-				break
+		cur = unit.path.cur
+		if cur is not None and 0 < cur <= len(path) and path[cur - 1] == unit_pos:
+			# while moving, the pather points at the step after the unit's position
+			position_of_unit_in_path = cur - 1
+		else:
+			for i, pos in enumerate(path):
+				if pos == unit_pos:
+					position_of_unit_in_path = i
+					break
 
 		# display units one ahead if possible, it looks nicer if the unit is moving
 		if len(path) > 1 and position_of_unit_in_path+1 < len(path):
 			position_of_unit_in_path += 1 #
-		path = path[position_of_unit_in_path:]
-
-		# draw every step-th coord
-		step = 1
-		relevant_coords = [path[0]]
-		for i in range(step, len(path), step):
-			relevant_coords.append(path[i])
-		relevant_coords.append(path[-1])
+		relevant_coords = path[position_of_unit_in_path:]
 
 		# get coords, actual drawing
 		use_rotation = self._get_rotation_setting()
 		self.minimap_image.set_drawing_enabled()
 		p = fife.Point(0, 0)
 		render_name = self._get_render_name("ship_route") + str(next(self.__class__.__ship_route_counter))
-		color = unit.owner.color.to_tuple()
+		color = unit.owner.color.rgb_tuple
 		last_coord = None
 		draw_point = self.minimap_image.rendertarget.addPoint
-		for i in relevant_coords:
-			coord = self._world_to_minimap(i, use_rotation)
+		world_to_minimap = self._world_to_minimap
+		minimap_coords = [world_to_minimap(c, use_rotation) for c in relevant_coords]
+		for coord in minimap_coords:
 			if last_coord is not None and \
-			   sum(abs(last_coord[i] - coord[i]) for i in (0, 1)) < 2:  # 2 is min dist in pixels
+			   abs(last_coord[0] - coord[0]) + abs(last_coord[1] - coord[1]) < 2:  # 2 is min dist in pixels
 				continue
 			last_coord = coord
 			p.x = coord[0]
@@ -550,104 +590,142 @@ class Minimap:
 		if where is None:
 			rt.removeAll(render_name)
 
-		location_left = self.location.left
-		location_top = self.location.top
+		self._fill_pixels(rt, render_name, where)
+
+	def _fill_pixels(self, rt, render_name, where=None):
+		"""Draw the pixels of the area `where` to the render target.
+
+		This is iter_minimap_points() inlined, the generator is too slow for drawing
+		the whole map. Keep both in sync.
+		"""
+		location = self.location
+		if where is None:
+			where = location
+		location_left = location.left
+		location_top = location.top
+		columns, rows = _get_real_map_coords(location, self.world, where)
+		full_map = self.world.full_map
+		island_color = self.COLORS["island"]
+		water_color = self.COLORS["water"]
+
 		draw_point = rt.addPoint
 		fife_point = fife.Point(0, 0)
 		use_rotation = self._get_rotation_setting()
+		# the rotation of a pixel only depends on its position and the current rotation
+		rotated_pixels = self._rotated_pixel_cache.setdefault(self.rotation, {})
+		rotate = self._rotate
+		rotations = self._rotations
+
+		for x, real_map_x in columns:
+			for y, real_map_y in rows:
+				# check what's at the covered_area
+				tile = full_map.get((real_map_x, real_map_y))
+				if tile is None:
+					color = water_color
+				else:
+					settlement = tile.settlement
+					if settlement is not None:
+						# pixel belongs to a player
+						color = settlement.owner.color.rgb_tuple
+					elif tile.id <= 0:
+						color = water_color
+					else:
+						color = island_color
 
-		for (x, y), color in iter_minimap_points(self.location, self.world,
-						self.COLORS["island"], self.COLORS["water"], where):
-			if use_rotation:
-				# inlined _get_rotated_coords
-				rot_x, rot_y = self._rotate((location_left + x, location_top + y), self._rotations)
-				fife_point.set(rot_x - location_left, rot_y - location_top)
-			else:
-				fife_point.set(x, y)
-			draw_point(render_name, fife_point, *color)
+				if use_rotation:
+					rotated = rotated_pixels.get((x, y))
+					if rotated is None:
+						# inlined _get_rotated_coords
+						rot_x, rot_y = rotate((location_left + x, location_top + y), rotations)
+						rotated = rotated_pixels[(x, y)] = (rot_x - location_left, rot_y - location_top)
+					fife_point.set(*rotated)
+				else:
+					fife_point.set(x, y)
+				draw_point(render_name, fife_point, *color)
 
 	def _timed_update(self, force=False):
 		"""Regular updates for domains we can't or don't want to keep track of."""
 		# OPTIMIZATION NOTE: There can be pretty many ships.
 		# Don't rely on the loop being rarely executed!
+		# The "base" layer (islands and settlements) is not touched here. It is
+		# only redrawn completely in draw() and partially via update() when a tile
+		# changes, so keep expensive full-map work out of this method.
 		# update ship icons
 		self.minimap_image.set_drawing_enabled()
+		rt = self.minimap_image.rendertarget
 		render_name = self._get_render_name("ship")
-		self.minimap_image.rendertarget.removeAll(render_name)
+		rt.removeAll(render_name)
 		use_rotation = self._get_rotation_setting()
 		# Make use of these dummy points instead of creating fife.Point instances
 		# (which are consuming a lot of resources).
 		dummy_point0 = fife.Point(0, 0)
 		dummy_point1 = fife.Point(0, 0)
+		# bind everything that is invariant in the loop to locals
+		add_image = rt.addImage
+		add_line = rt.addLine
+		draw_point = rt.addPoint
+		world_to_minimap = self._world_to_minimap
+		flag_lines = self.SHIP_FLAG_LINES
+		selected_instances = self.session.selected_instances
+		selection_color = self.COLORS["water"]
+		pirate = self.session.world.pirate
+		# the icons are the same for all ships, load them only once
+		pirate_ship_icon = None
+		neutral_ship_icon = None
 		for ship in self.world.ships:
 			if not ship.in_ship_map:
 				continue # no fisher ships, etc
-			coord = self._world_to_minimap(ship.position.to_tuple(), use_rotation)
-			color = ship.owner.color.to_tuple()
+			coord_x, coord_y = world_to_minimap(ship.position.to_tuple(), use_rotation)
+			owner = ship.owner
+			color = owner.color.rgb_tuple
 			# set correct icon
-			if ship.owner is self.session.world.pirate:
-				ship_icon_path = self.__class__.SHIP_PIRATE
+			if owner is pirate:
+				if pirate_ship_icon is None:
+					pirate_ship_icon = self.imagemanager.load(self.SHIP_PIRATE)
+				ship_icon = pirate_ship_icon
 			else:
-				ship_icon_path = self.__class__.SHIP_NEUTRAL
-			ship_icon = self.imagemanager.load(ship_icon_path)
-			dummy_point1.set(coord[0], coord[1])
-			self.minimap_image.rendertarget.addImage(render_name, dummy_point1, ship_icon)
-			if ship.owner.regular_player:
+				if neutral_ship_icon is None:
+					neutral_ship_icon = self.imagemanager.load(self.SHIP_NEUTRAL)
+				ship_icon = neutral_ship_icon
+			dummy_point1.set(coord_x, coord_y)
+			add_image(render_name, dummy_point1, ship_icon)
+			if owner.regular_player:
 				# add the 'flag' over the ship icon, with the color of the owner
-				dummy_point0.set(coord[0] - 5, coord[1] - 5)
-				dummy_point1.set(coord[0], coord[1] - 5)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0,
-									dummy_point1, color[0], color[1], color[2])
-				dummy_point0.set(coord[0] - 6, coord[1] - 6)
-				dummy_point1.set(coord[0], coord[1] - 6)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0,
-									dummy_point1, color[0], color[1], color[2])
-				dummy_point0.set(coord[0] - 4, coord[1] - 4)
-				dummy_point1.set(coord[0], coord[1] - 4)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0,
-									dummy_point1, color[0], color[1], color[2])
-				# add black border around the flag
-				dummy_point0.set(coord[0] - 6, coord[1] - 7)
-				dummy_point1.set(coord[0], coord[1] - 7)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0, dummy_point1, 0, 0, 0)
-				dummy_point0.set(coord[0] - 4, coord[1] - 3)
-				dummy_point1.set(coord[0], coord[1] - 4)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0, dummy_point1, 0, 0, 0)
-				dummy_point0.set(coord[0] - 6, coord[1] - 7)
-				dummy_point1.set(coord[0] - 4, coord[1] - 3)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0, dummy_point1, 0, 0, 0)
+				for (x0_off, y0_off), (x1_off, y1_off), line_color in flag_lines:
+					dummy_point0.set(coord_x + x0_off, coord_y + y0_off)
+					dummy_point1.set(coord_x + x1_off, coord_y + y1_off)
+					add_line(render_name, dummy_point0, dummy_point1, *(line_color or color))
 
 			# TODO: nicer selected view
-			dummy_point0.set(coord[0], coord[1])
-			draw_point = self.minimap_image.rendertarget.addPoint
-			if ship in self.session.selected_instances:
-				draw_point(render_name, dummy_point0, *Minimap.COLORS["water"])
+			if ship in selected_instances:
+				dummy_point0.set(coord_x, coord_y)
+				draw_point(render_name, dummy_point0, *selection_color)
 				for x_off, y_off in ((-2,  0),
 				                     (+2,  0),
 				                     ( 0, -2),
 				                     ( 0, +2)):
-					dummy_point1.set(coord[0] + x_off, coord[1] + y_off)
+					dummy_point1.set(coord_x + x_off, coord_y + y_off)
 					draw_point(render_name, dummy_point1, *color)
 
 		# draw settlement warehouses if something has changed
-		settlements = self.world.settlements
-		# save only worldids as to not introduce actual coupling
-		cur_settlements = set(i.worldid for i in settlements)
-		if force or \
-		   (not hasattr(self, "_last_settlements") or cur_settlements != self._last_settlements):
+		settlements_version = self.world.settlements_version
+		if force or settlements_version != self._last_settlements_version:
 			# update necessary
 			warehouse_render_name = self._get_render_name("warehouse")
-			self.minimap_image.rendertarget.removeAll(warehouse_render_name)
-			for settlement in settlements:
+			rt.removeAll(warehouse_render_name)
+			# all warehouses share the same image, so only load and scale it once
+			img, (new_width, new_height) = self._get_scaled_image(self.__class__.WAREHOUSE_IMAGE)
+			resize_image = rt.resizeImage
+			p = self.__class__._dummy_fife_point
+			for settlement in self.world.settlements:
 				coord = settlement.warehouse.position.center.to_tuple()
-				coord = self._world_to_minimap(coord, use_rotation)
-				self._update_image(self.__class__.WAREHOUSE_IMAGE,
-				                   warehouse_render_name,
-				                   coord)
-			self._last_settlements = cur_settlements
-
-	def _update_image(self, img_path, name, coord_tuple):
-		"""Updates image as part of minimap (e.g. when it has moved)"""
+				p.set(*world_to_minimap(coord, use_rotation))
+				# resizeImage also means draw
+				resize_image(warehouse_render_name, p, img, new_width, new_height)
+			self._last_settlements_version = settlements_version
+
+	def _get_scaled_image(self, img_path):
+		"""Returns the image and its size on the minimap as (img, (width, height))"""
 		img = self.imagemanager.load(img_path)
 
 		size_tuple = self._image_size_cache.get(img_path)
@@ -656,11 +734,7 @@ class Minimap:
 			ratio = max(1.0, ratio)
 			size_tuple = int(img.getWidth()/ratio), int(img.getHeight()/ratio)
 			self._image_size_cache[img_path] = size_tuple
-		new_width, new_height = size_tuple
-		p = self.__class__._dummy_fife_point
-		p.set(*coord_tuple)
-		# resizeImage also means draw
-		self.minimap_image.rendertarget.resizeImage(name, p, img, new_width, new_height)
+		return img, size_tuple
 
 	def rotate_right(self):
 		# keep track of rotation at any time, but only apply
@@ -700,26 +774,21 @@ class Minimap:
 			self._rotation_setting = message.new_value
 			self.draw()
 
-	_rotations = { 0 : 0,
-				         1 : 3 * math.pi / 2,
-				         2 : math.pi,
-				         3 : math.pi / 2
-				         }
+	# rotation -> (cos, sin) of the rotation angle, there are only 4 of them
+	_rotations = {rotation: (cos(angle), sin(angle)) for rotation, angle in
+	              ((0, 0), (1, 3 * math.pi / 2), (2, math.pi), (3, math.pi / 2))}
 	def _get_rotated_coords(self, tup):
 		"""Rotates according to current rotation settings.
 		Input coord must be relative to screen origin, not minimap origin"""
 		return self._rotate(tup, self._rotations)
 
-	_from_rotations = { 0 : 0,
-				              1 : math.pi / 2,
-				              2 : math.pi,
-				              3 : 3 * math.pi / 2
-				              }
+	_from_rotations = {rotation: (cos(angle), sin(angle)) for rotation, angle in
+	                   ((0, 0), (1, math.pi / 2), (2, math.pi), (3, 3 * math.pi / 2))}
 	def _get_from_rotated_coords(self, tup):
 		return self._rotate(tup, self._from_rotations)
 
 	def _rotate(self, tup, rotations):
-		rotation = rotations[self.rotation]
+		cos_rotation, sin_rotation = rotations[self.rotation]
 
 		x = tup[0]
 		y = tup[1]
@@ -728,8 +797,8 @@ class Minimap:
 		x -= self.location_center.x
 		y -= self.location_center.y
 
-		new_x = x * cos(rotation) - y * sin(rotation)
-		new_y = x * sin(rotation) + y * cos(rotation)
+		new_x = x * cos_rotation - y * sin_rotation
+		new_y = x * sin_rotation + y * cos_rotation
 
 		new_x += self.location_center.x
 		new_y += self.location_center.y
@@ -775,6 +844,7 @@ class _MinimapImage:
 	"""Encapsulates handling of fife Image.
 	Provides:
 	- self.rendertarget: instance of fife.RenderTarget
+	- self.gui_image: the image wrapped for use in pychan icons
 	"""
 	def __init__(self, minimap, targetrenderer):
 		self.minimap = minimap
@@ -782,6 +852,8 @@ class _MinimapImage:
 		size = self.minimap.get_size()
 		self.image = self.minimap.imagemanager.loadBlank(size[0], size[1])
 		self.rendertarget = targetrenderer.createRenderTarget(self.image)
+		# the image stays the same, so it only needs to be wrapped once
+		self.gui_image = fife.GuiImage(self.image)
 		self.set_drawing_enabled()
 
 	def reset(self):
@@ -797,6 +869,10 @@ class _MinimapImage:
 		                          *Minimap.COLORS["water"])
 
 	def set_drawing_enabled(self):
-		"""Always call this."""
+		"""Always call this.
+
+		This does not bind anything, it schedules the render target to be drawn
+		on the next frame. Calls can therefore not be skipped, even if nothing but
+		this minimap is drawn, or the changes won't show up."""
 		targetname = self.rendertarget.getTarget().getName()
 		self.targetrenderer.setRenderTarget(targetname, False, 0)
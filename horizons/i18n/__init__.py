@@ -39,7 +39,7 @@ import platform
 from typing import Dict, Optional, Text
 
 import horizons.globals
-from horizons.constants import FONTDEFS, LANGUAGENAMES
+from horizons.constants import LANGUAGENAMES, LIBERTINE_LOCALES
 from horizons.ext.speaklater import make_lazy_gettext
 from horizons.messaging import LanguageChanged
 
@@ -107,7 +107,7 @@ def find_available_languages(domain='unknown-horizons', update=False):
 
 def get_fontdef_for_locale(locale):
 	"""Returns path to the fontdef file for a locale. Unifont is default."""
-	fontdef_file = FONTDEFS.get(locale, 'unifont')
+	fontdef_file = 'libertine' if locale in LIBERTINE_LOCALES else 'unifont'
 	return os.path.join('content', 'fonts', '{0}.xml'.format(fontdef_file))
 
 
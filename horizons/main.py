@@ -538,10 +538,12 @@ def _create_main_db():
 	"""Returns a dbreader instance, that is connected to the main game data dbfiles.
 	NOTE: This data is read_only, so there are no concurrency issues."""
 	_db = UhDbAccessor(':memory:')
+	# concatenate all files to run them as one script in a single transaction
+	scripts = []
 	for i in PATHS.DB_FILES:
 		with open(i, "r") as f:
-			sql = "BEGIN TRANSACTION;" + f.read() + "COMMIT;"
-		_db.execute_script(sql)
+			scripts.append(f.read())
+	_db.execute_script("BEGIN TRANSACTION;\n" + "\n".join(scripts) + "\nCOMMIT;")
 	return _db
 
 
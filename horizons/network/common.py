@@ -56,6 +56,10 @@ class Address:
 
 nulltranslation = NullTranslations()
 class Player:
+	# the server accesses players for every packet
+	__slots__ = ('peer', 'address', 'sid', 'protocol', 'version', 'name', 'color',
+	             'clientid', 'game', 'ready', 'prepared', 'fetch', 'gettext')
+
 	def __init__(self, peer, sid, protocol=0):
 		# pickle doesn't use all of these attributes
 		# for more detail check __getstate__()
@@ -90,6 +94,11 @@ class Player:
 				'clientid': self.clientid
 			}
 
+	def __setstate__(self, state):
+		# there is no __dict__ pickle could update
+		for key, value in state.items():
+			setattr(self, key, value)
+
 	def __hash__(self):
 		return hash((self.address))
 
@@ -135,6 +144,9 @@ packets.SafeUnpickler.add('server', Player)
 #-----------------------------------------------------------------------------
 
 class Game:
+	# attributes that clients never get to see
+	server_only_attributes = ('player_names', 'player_colors', 'player_clientids', 'other_peers')
+
 	class State:
 		Open      = 0
 		Prepare   = 1
@@ -161,6 +173,11 @@ class Game:
 		self.players       = []
 		self.playercnt     = 0 # needed for privacy for gamelist-requests
 		self.state         = Game.State.Open
+		# names, colors and client ids of the players, which must be unique
+		self.player_names     = set()
+		self.player_colors    = set()
+		self.player_clientids = set()
+		self.other_peers      = {} # sid => peers of all other players, see get_other_peers()
 		self.add_player(self.creator, packet)
 
 	# for pickle: return only relevant data to the player
@@ -175,6 +192,10 @@ class Game:
 		# overwrite private data
 		state['password'] = bool(self.password)
 
+		# only used by the server
+		for attribute in self.server_only_attributes:
+			state.pop(attribute, None)
+
 		# make data backwards compatible
 		state['creator'] = self.creator.name
 		state['clientversion'] = self.creator.version
@@ -197,6 +218,10 @@ class Game:
 		player.join(self, packet)
 		self.players.append(player)
 		self.playercnt += 1
+		self.player_names.add(player.name)
+		self.player_colors.add(player.color)
+		self.player_clientids.add(player.clientid)
+		self.other_peers.clear()
 		return player
 
 	def remove_player(self, player):
@@ -204,9 +229,39 @@ class Game:
 			return None
 		self.players.remove(player)
 		self.playercnt -= 1
+		self.player_names.discard(player.name)
+		self.player_colors.discard(player.color)
+		self.player_clientids.discard(player.clientid)
+		self.other_peers.clear()
 		player.game = None
 		return player
 
+	def get_other_peers(self, player):
+		"""Returns the peers of all players except player. This is needed for
+		every game data packet, so the result is cached until the players change."""
+		peers = self.other_peers.get(player.sid)
+		if peers is None:
+			peers = self.other_peers[player.sid] = tuple(
+				_player.peer for _player in self.players if _player is not player)
+		return peers
+
+	def change_player_name(self, player, name):
+		self.player_names.discard(player.name)
+		player.name = name
+		self.player_names.add(name)
+
+	def change_player_color(self, player, color):
+		self.player_colors.discard(player.color)
+		player.color = color
+		self.player_colors.add(color)
+
+	def get_free_color(self):
+		"""Returns the lowest color that no player uses"""
+		color = 1
+		while color in self.player_colors:
+			color += 1
+		return color
+
 	def is_full(self):
 		return (self.playercnt == self.maxplayers)
 
@@ -231,6 +286,10 @@ class Game:
 			player.game = None
 		del self.players[:]
 		self.playercnt = 0
+		self.player_names.clear()
+		self.player_colors.clear()
+		self.player_clientids.clear()
+		self.other_peers.clear()
 
 	def __str__(self):
 		return "Game(uuid={};maxpl={:d};plcnt={:d};pw={:d};state={})" \
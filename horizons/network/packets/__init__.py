@@ -97,13 +97,28 @@ class SafeUnpickler:
 
 	@classmethod
 	def loads(cls, str):
-		class CustomUnpickler(pickle.Unpickler):
-			find_global = cls.find_class
-
 		file = BytesIO(str)
 		return CustomUnpickler(file).load()
 
 
+# pickle protocol 2 writes python 2 module names, overriding find_class()
+# disables the mapping pickle does for them otherwise
+PICKLE_PY2_MODULES = {
+	'__builtin__': 'builtins',
+	'copy_reg':    'copyreg',
+}
+
+# NOTE: this is used for every packet, don't create the class in loads()
+class CustomUnpickler(pickle.Unpickler):
+	def find_class(self, module, name):
+		module = PICKLE_PY2_MODULES.get(module, module)
+		return SafeUnpickler.find_class(module, name)
+
+# sets are pickled as globals, commands use them (e.g. Build.tearset)
+SafeUnpickler.add('common', set)
+SafeUnpickler.add('common', frozenset)
+
+
 #-------------------------------------------------------------------------------
 
 class packet:
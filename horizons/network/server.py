@@ -21,7 +21,9 @@
 
 import gettext
 import logging
+import time
 import uuid
+from collections import OrderedDict
 
 from horizons import network
 from horizons.i18n import find_available_languages
@@ -31,6 +33,10 @@ from horizons.network.common import ErrorType, Game, Player
 if not enet:
 	raise Exception("Could not find enet module.")
 
+# used for every packet we send
+_ENET_PACKET = enet.Packet
+_PACKET_FLAG_RELIABLE = enet.PACKET_FLAG_RELIABLE
+
 
 MAX_PEERS = 4095
 CONNECTION_TIMEOUT = 500
@@ -48,6 +54,8 @@ class Server:
 		self.host     = None
 		self.hostname = hostname
 		self.port     = port
+		# packets are only queued by send() and flushed once per event
+		self.flush_pending = False
 		self.statistic = {
 			'file':      statistic_file,
 			'timestamp': 0,
@@ -61,6 +69,8 @@ class Server:
 			# individual packet classes
 			'maxpacketsize' : 2 * 1024 * 1024,
 		}
+		# checked for every received packet
+		self.max_packet_size = self.capabilities['maxpacketsize']
 		self.callbacks = {
 			'onconnect':     [self.onconnect],
 			'ondisconnect':  [self.ondisconnect],
@@ -87,7 +97,9 @@ class Server:
 			'terminategame': [self.terminategame],
 			'gamedata':      [self.gamedata],
 		}
-		self.games   = [] # list of games
+		# game lists are sent in creation order
+		self.games   = OrderedDict() # uuid => Game() dict
+		self.open_games = {protocol: OrderedDict() for protocol in PROTOCOLS} # creator protocol => uuid => open Game()
 		self.players = {} # sessionid => Player() dict
 		self.i18n    = {} # lang => gettext dict
 		self.check_urandom()
@@ -149,45 +161,56 @@ class Server:
 
 
 	def call_callbacks(self, type, *args):
-		if type not in self.callbacks:
+		callbacks = self.callbacks.get(type)
+		if callbacks is None:
 			return
 		ret = True
-		for callback in self.callbacks[type]:
-			tmp = callback(*args)
-			if tmp is None:
-				tmp = True
-			ret &= tmp
+		for callback in callbacks:
+			# callbacks returning None count as success
+			if callback(*args) is False:
+				ret = False
 		return ret
 
 
 	def run(self):
-		logging.info("Starting up server on {0!s}:{1:d}".format(self.hostname, self.port))
+		logging.info("Starting up server on %s:%d", self.hostname, self.port)
 		try:
 			self.host = enet.Host(enet.Address(self.hostname, self.port), MAX_PEERS, 0, 0, 0)
 		except (IOError, MemoryError) as e:
 			# these exceptions do not provide any information.
 			raise network.NetworkException("Unable to create network structure: {0!s}".format((e)))
 
+		# callbacks to call for the enet events. these are the lists in
+		# self.callbacks, so callbacks registered later are called too
+		event_callbacks = {
+			enet.EVENT_TYPE_CONNECT:    self.callbacks['onconnect'],
+			enet.EVENT_TYPE_DISCONNECT: self.callbacks['ondisconnect'],
+			enet.EVENT_TYPE_RECEIVE:    self.callbacks['onreceive'],
+		}
+
 		logging.debug("Entering the main loop...")
 		while True:
 			if self.statistic['file'] is not None:
-				if self.statistic['timestamp'] <= 0:
+				# service() returns as soon as an event arrives, so we can't count
+				# timeouts here. on a busy server that would write the file constantly
+				now = time.monotonic() * 1000
+				if now >= self.statistic['timestamp']:
 					self.print_statistic(self.statistic['file'])
-					self.statistic['timestamp'] = self.statistic['interval']
-				else:
-					self.statistic['timestamp'] -= CONNECTION_TIMEOUT
+					self.statistic['timestamp'] = now + self.statistic['interval']
 
 			event = self.host.service(CONNECTION_TIMEOUT)
 			if event.type == enet.EVENT_TYPE_NONE:
 				continue
-			elif event.type == enet.EVENT_TYPE_CONNECT:
-				self.call_callbacks("onconnect", event)
-			elif event.type == enet.EVENT_TYPE_DISCONNECT:
-				self.call_callbacks("ondisconnect", event)
-			elif event.type == enet.EVENT_TYPE_RECEIVE:
-				self.call_callbacks("onreceive", event)
+			callbacks = event_callbacks.get(event.type)
+			if callbacks is None:
+				logging.warning("Invalid packet (%s)", event.type)
+			elif len(callbacks) == 1:
+				# this is the hot path, usually only the server's own handler is registered
+				callbacks[0](event)
 			else:
-				logging.warning("Invalid packet ({0})".format(event.type))
+				for callback in callbacks:
+					callback(event)
+			self.flush()
 
 
 	def send(self, peer, packet, channelid=0):
@@ -196,17 +219,32 @@ class Server:
 
 		self.sendraw(peer, packet.serialize(), channelid)
 
+	def broadcast(self, players, packet, channelid=0):
+		"""Sends the same packet to several players, serializing it only once"""
+		if self.host is None:
+			raise network.NotConnected("Server is not running")
+
+		data = packet.serialize()
+		for player in players:
+			self.sendraw(player.peer, data, channelid)
+
 	def sendraw(self, peer, data, channelid=0):
 		if self.host is None:
 			raise network.NotConnected("Server is not running")
 
-		packet = enet.Packet(data, enet.PACKET_FLAG_RELIABLE)
-		peer.send(channelid, packet)
-		self.host.flush()
+		peer.send(channelid, _ENET_PACKET(data, _PACKET_FLAG_RELIABLE))
+		self.flush_pending = True
+
+	def flush(self):
+		"""Sends all queued packets. Broadcasts to several players only need
+		to be flushed once, so this is done after handling each event."""
+		if self.flush_pending:
+			self.host.flush()
+			self.flush_pending = False
 
 
 	def disconnect(self, peer, later=True):
-		logging.debug("[DISCONNECT] Disconnecting client {0!s}".format(peer.address))
+		logging.debug("[DISCONNECT] Disconnecting client %s", peer.address)
 		try:
 			if later:
 				peer.disconnect_later()
@@ -238,7 +276,7 @@ class Server:
 		#	self._fatalerror(event.peer, "You can't connect more than once")
 		#	return
 		player = Player(event.peer, self.generate_session_id(), event.data)
-		logging.debug("[CONNECT] New Client: {0!s}".format(player))
+		logging.debug("[CONNECT] New Client: %s", player)
 
 		# store session id inside enet.peer.data
 		# NOTE: ALWAYS initialize peer.data
@@ -246,7 +284,7 @@ class Server:
 		event.peer.data = session_id
 
 		if player.protocol not in PROTOCOLS:
-			logging.warning("[CONNECT] {0!s} runs old or unsupported protocol".format(player))
+			logging.warning("[CONNECT] %s runs old or unsupported protocol", player)
 			self.fatalerror(player, __("Old or unsupported multiplayer protocol. Please check your game version"))
 			return
 
@@ -257,31 +295,35 @@ class Server:
 
 	def ondisconnect(self, event):
 		peer = event.peer
+		# reading peer.data creates a new bytes object, so only do it once
+		session_id = peer.data
 		# check need for early disconnects (e.g. old protocol)
-		if peer.data not in self.players:
+		player = self.players.get(session_id)
+		if player is None:
 			return
-		player = self.players[peer.data]
-		logging.debug("[DISCONNECT] {0!s} disconnected".format(player))
+		logging.debug("[DISCONNECT] %s disconnected", player)
 		if player.game is not None:
 			self.call_callbacks("leavegame", player)
-		del self.players[peer.data]
+		del self.players[session_id]
 
 
 	def onreceive(self, event):
 		peer = event.peer
-		#logging.debug("[RECEIVE] Got data from %s" % (peer.address))
 		# check player is known by server
-		if peer.data not in self.players:
-			logging.warning("[RECEIVE] Packet from unknown player {0!s}!".format(peer.address))
-			self._fatalerror(event.peer, "I don't know you")
+		# NOTE: peer.data has to stay a session id, enet can only store bytes there
+		player = self.players.get(peer.data)
+		if player is None:
+			logging.warning("[RECEIVE] Packet from unknown player %s!", peer.address)
+			self._fatalerror(peer, "I don't know you")
 			return
 
-		player = self.players[peer.data]
-
 		# check packet size
-		if len(event.packet.data) > self.capabilities['maxpacketsize']:
-			logging.warning("[RECEIVE] Global packet size exceeded from {0!s}: size={1:d}".
-				format(peer.address, len(event.packet.data)))
+		# NOTE: every access to packet.data creates a new bytes object
+		data = event.packet.data
+		size = len(data)
+		if size > self.max_packet_size:
+			logging.warning("[RECEIVE] Global packet size exceeded from %s: size=%d",
+				peer.address, size)
 			self.fatalerror(player, __("You've exceeded the global packet size.") + " " +
 			                        __("This should never happen. "
 			                           "Please contact us or file a bug report."))
@@ -289,41 +331,46 @@ class Server:
 
 		# shortpath if game is running
 		if player.game is not None and player.game.state is Game.State.Running:
-			self.call_callbacks('gamedata', player, event.packet.data)
+			# this is the hot path, skip call_callbacks() unless there are additional callbacks
+			gamedata_callbacks = self.callbacks['gamedata']
+			if len(gamedata_callbacks) == 1:
+				gamedata_callbacks[0](player, data)
+			else:
+				self.call_callbacks('gamedata', player, data)
 			return
 
 		packet = None
 		try:
-			packet = packets.unserialize(event.packet.data, True, player.protocol)
+			packet = packets.unserialize(data, True, player.protocol)
 		except network.SoftNetworkException as e:
 			self.error(player, str(e))
 			return
 		except network.PacketTooLarge as e:
-			logging.warning("[RECEIVE] Per packet size exceeded from {0!s}: {1!s}".
-				format(player, e))
+			logging.warning("[RECEIVE] Per packet size exceeded from %s: %s",
+				player, e)
 			self.fatalerror(player, __("You've exceeded the per packet size.") + " " +
 			                        __("This should never happen. "
 			                           "Please contact us or file a bug report.") +
 			                        " " + str(e))
 			return
 		except Exception as e:
-			logging.warning("[RECEIVE] Unknown or malformed packet from {0!s}: {1!s}".
-				format(player, e))
+			logging.warning("[RECEIVE] Unknown or malformed packet from %s: %s",
+				player, e)
 			self.fatalerror(player, __("Unknown or malformed packet. Please check your game version"))
 			return
 
 		# session id check
 		if packet.sid != player.sid:
 			logging.warning(
-				"[RECEIVE] Invalid session id for player {0!s} ({1!s} vs {2!s})!".
-				format(peer.address, packet.sid, player.sid))
+				"[RECEIVE] Invalid session id for player %s (%s vs %s)!",
+				peer.address, packet.sid, player.sid)
 			# this will trigger ondisconnect() for cleanup
 			self.fatalerror(player, __("Invalid/Unknown session"))
 			return
 
 		if packet.__class__ not in self.callbacks:
-			logging.warning("[RECEIVE] Unhandled network packet from {0!s} - Ignoring!".
-				format(peer.address))
+			logging.warning("[RECEIVE] Unhandled network packet from %s - Ignoring!",
+				peer.address)
 			return
 		self.call_callbacks(packet.__class__, player, packet)
 
@@ -331,18 +378,18 @@ class Server:
 	def onerror(self, player, packet):
 		# we shouldn't receive any errors from client
 		# so ignore them all
-		logging.debug("[ERROR] Client Message: {0!s}".format(packet.errorstr))
+		logging.debug("[ERROR] Client Message: %s", packet.errorstr)
 
 
 	def onfatalerror(self, player, packet):
 		# we shouldn't receive any fatala errors from client
 		# so just disconnect them
-		logging.debug("[FATAL] Client Message: {0!s}".format(packet.errorstr))
+		logging.debug("[FATAL] Client Message: %s", packet.errorstr)
 		self.disconnect(player.peer)
 
 
 	def onsessionprops(self, player, packet):
-		logging.debug("[PROPS] {0!s}".format(player))
+		logging.debug("[PROPS] %s", player)
 		if hasattr(packet, 'lang'):
 			if packet.lang in self.i18n:
 				player.gettext = self.i18n[packet.lang]
@@ -358,23 +405,35 @@ class Server:
 				"You can't run a game with more than {0:d} players".
 				format(self.capabilities['maxplayers']))
 		game = Game(packet, player)
-		logging.debug("[CREATE] [{0!s}] {1!s} created {2!s}".format(game.uuid, player, game))
-		self.games.append(game)
+		logging.debug("[CREATE] [%s] %s created %s", game.uuid, player, game)
+		self.games[game.uuid] = game
+		self.open_games[player.protocol][game.uuid] = game
 		self.send(player.peer, packets.server.data_gamestate(game))
 
 	def deletegame(self, game):
-		logging.debug("[REMOVE] [{0!s}] {1!s} removed".format(game.uuid, game))
+		logging.debug("[REMOVE] [%s] %s removed", game.uuid, game)
 		game.clear()
-		self.games.remove(game)
+		del self.games[game.uuid]
+		self.open_games[game.creator.protocol].pop(game.uuid, None)
+
+	def set_game_state(self, game, state):
+		"""Changes the state of a game and keeps open_games up to date"""
+		game.state = state
+		protocol = game.creator.protocol
+		open_games = self.open_games[protocol]
+		if not game.is_open() or game.uuid not in self.games:
+			open_games.pop(game.uuid, None)
+		elif game.uuid not in open_games:
+			# reopened, rebuild the index to keep the creation order
+			self.open_games[protocol] = OrderedDict(
+				(_uuid, _game) for _uuid, _game in self.games.items()
+				if _game.creator.protocol == protocol and _game.is_open())
 
 	def onlistgames(self, player, packet):
 		logging.debug("[LIST]")
 		gameslist = packets.server.data_gameslist()
-		for _game in self.games:
-			if _game.creator.protocol != player.protocol:
-				continue
-			if not _game.is_open():
-				continue
+		# only open games of the same protocol can be joined
+		for _game in self.open_games[player.protocol].values():
 			if _game.is_full():
 				continue
 			if packet.clientversion != -1 and packet.clientversion != _game.creator.version:
@@ -388,14 +447,9 @@ class Server:
 
 
 	def __find_game_from_uuid(self, packet):
-		game = None
-		for _game in self.games:
-			if packet.clientversion != _game.creator.version:
-				continue
-			if packet.uuid != _game.uuid:
-				continue
-			game = _game
-			break
+		game = self.games.get(packet.uuid)
+		if game is None or packet.clientversion != game.creator.version:
+			return None
 		return game
 
 
@@ -421,33 +475,25 @@ class Server:
 		# protocol=0
 		# assign free color
 		if packet.playercolor is None:
-			colors = []
-			for _player in game.players:
-				colors.append(_player.color)
-			for color in range(1, len(colors) + 2):
-				if color not in colors:
-					break
-			packet.playercolor = color
+			packet.playercolor = game.get_free_color()
 
 		# make sure player names, colors and clientids are unique
-		for _player in game.players:
-			if _player.name == packet.playername:
-				self.error(player, __("There's already a player with your name inside this game.") + " " +
-				                   __("Please change your name."))
-				return
-			if _player.color == packet.playercolor:
-				self.error(player, __("There's already a player with your color inside this game.") + " " +
-				                   __("Please change your color."))
-				return
-			if _player.clientid == packet.clientid:
-				self.error(player, __("There's already a player with your unique player ID inside this game. "
-				                      "This should never occur."))
-				return
-
-		logging.debug("[JOIN] [{0!s}] {1!s} joined {2!s}".format(game.uuid, player, game))
+		if packet.playername in game.player_names:
+			self.error(player, __("There's already a player with your name inside this game.") + " " +
+			                   __("Please change your name."))
+			return
+		if packet.playercolor in game.player_colors:
+			self.error(player, __("There's already a player with your color inside this game.") + " " +
+			                   __("Please change your color."))
+			return
+		if packet.clientid in game.player_clientids:
+			self.error(player, __("There's already a player with your unique player ID inside this game. "
+			                      "This should never occur."))
+			return
+
+		logging.debug("[JOIN] [%s] %s joined %s", game.uuid, player, game)
 		game.add_player(player, packet)
-		for _player in game.players:
-			self.send(_player.peer, packets.server.data_gamestate(game))
+		self.broadcast(game.players, packets.server.data_gamestate(game))
 
 		if player.protocol == 0:
 			if game.is_full():
@@ -468,13 +514,12 @@ class Server:
 		if not game.is_open():
 			self.call_callbacks('terminategame', game, player)
 			return
-		logging.debug("[LEAVE] [{0!s}] {1!s} left {2!s}".format(game.uuid, player, game))
+		logging.debug("[LEAVE] [%s] %s left %s", game.uuid, player, game)
 		game.remove_player(player)
 		if game.is_empty():
 			self.call_callbacks('deletegame', game)
 			return
-		for _player in game.players:
-			self.send(_player.peer, packets.server.data_gamestate(game))
+		self.broadcast(game.players, packets.server.data_gamestate(game))
 		# the creator leaving the game is a hard error too
 		if player.protocol >= 1 and player == game.creator:
 			self.call_callbacks('terminategame', game, player)
@@ -482,8 +527,8 @@ class Server:
 
 
 	def terminategame(self, game, player=None):
-		logging.debug("[TERMINATE] [{0!s}] (by {1!s})".
-			format(game.uuid, player if player is not None else None))
+		logging.debug("[TERMINATE] [%s] (by %s)",
+			game.uuid, player if player is not None else None)
 		if game.creator.protocol >= 1 and game.is_open():
 			# NOTE: works with protocol >= 1
 			for _player in game.players:
@@ -499,19 +544,19 @@ class Server:
 
 
 	def preparegame(self, game):
-		logging.debug("[PREPARE] [{0!s}] Players: {1!s}".
-			format(game.uuid, [str(i) for i in game.players]))
-		game.state = Game.State.Prepare
-		for _player in game.players:
-			self.send(_player.peer, packets.server.cmd_preparegame())
+		if logging.getLogger().isEnabledFor(logging.DEBUG):
+			logging.debug("[PREPARE] [%s] Players: %s",
+				game.uuid, [str(i) for i in game.players])
+		self.set_game_state(game, Game.State.Prepare)
+		self.broadcast(game.players, packets.server.cmd_preparegame())
 
 
 	def startgame(self, game):
-		logging.debug("[START] [{0!s}] Players: {1!s}".
-			format(game.uuid, [str(i) for i in game.players]))
-		game.state = Game.State.Running
-		for _player in game.players:
-			self.send(_player.peer, packets.server.cmd_startgame())
+		if logging.getLogger().isEnabledFor(logging.DEBUG):
+			logging.debug("[START] [%s] Players: %s",
+				game.uuid, [str(i) for i in game.players])
+		self.set_game_state(game, Game.State.Running)
+		self.broadcast(game.players, packets.server.cmd_startgame())
 
 
 	def onchat(self, player, packet):
@@ -523,9 +568,8 @@ class Server:
 		# don't send packets to already started games
 		if not game.is_open():
 			return
-		logging.debug("[CHAT] [{0!s}] {1!s}: {2!s}".format(game.uuid, player, packet.chatmsg))
-		for _player in game.players:
-			self.send(_player.peer, packets.server.cmd_chatmsg(player.name, packet.chatmsg))
+		logging.debug("[CHAT] [%s] %s: %s", game.uuid, player, packet.chatmsg)
+		self.broadcast(game.players, packets.server.cmd_chatmsg(player.name, packet.chatmsg))
 
 
 	def onchangename(self, player, packet):
@@ -543,18 +587,16 @@ class Server:
 			return
 
 		# make sure player names are unique
-		for _player in game.players:
-			if _player.name == packet.playername:
-				self.error(player, __("There's already a player with your name inside this game.") + " " +
-				                   __("Unable to change your name."))
-				return
+		if packet.playername in game.player_names:
+			self.error(player, __("There's already a player with your name inside this game.") + " " +
+			                   __("Unable to change your name."))
+			return
 
 		# ACK the change
-		logging.debug("[CHANGENAME] [{0!s}] {1!s} -> {2!s}".
-			format(game.uuid, player.name, packet.playername))
-		player.name = packet.playername
-		for _player in game.players:
-			self.send(_player.peer, packets.server.data_gamestate(game))
+		logging.debug("[CHANGENAME] [%s] %s -> %s",
+			game.uuid, player.name, packet.playername)
+		game.change_player_name(player, packet.playername)
+		self.broadcast(game.players, packets.server.data_gamestate(game))
 
 
 	def onchangecolor(self, player, packet):
@@ -572,27 +614,22 @@ class Server:
 			return
 
 		# make sure player colors are unique
-		for _player in game.players:
-			if _player.color == packet.playercolor:
-				self.error(player, __("There's already a player with your color inside this game.") + " " +
-				                   __("Unable to change your color."))
-				return
+		if packet.playercolor in game.player_colors:
+			self.error(player, __("There's already a player with your color inside this game.") + " " +
+			                   __("Unable to change your color."))
+			return
 
 		# ACK the change
-		logging.debug("[CHANGECOLOR] [{0!s}] Player:{1!s} {2!s} -> {3!s}".
-			format(game.uuid, player.name, player.color, packet.playercolor))
-		player.color = packet.playercolor
-		for _player in game.players:
-			self.send(_player.peer, packets.server.data_gamestate(game))
+		logging.debug("[CHANGECOLOR] [%s] Player:%s %s -> %s",
+			game.uuid, player.name, player.color, packet.playercolor)
+		game.change_player_color(player, packet.playercolor)
+		self.broadcast(game.players, packets.server.data_gamestate(game))
 
 
 	def gamedata(self, player, data):
 		game = player.game
-		#logging.debug("[GAMEDATA] [%s] %s" % (game.uuid, player))
-		for _player in game.players:
-			if _player is player:
-				continue
-			self.sendraw(_player.peer, data)
+		for peer in game.get_other_peers(player):
+			self.sendraw(peer, data)
 
 
 	# this event happens after a player is done with loading
@@ -601,7 +638,7 @@ class Server:
 		game = player.game
 		if game is None:
 			return
-		logging.debug("[PREPARED] [{0!s}] {1!s}".format(game.uuid, player))
+		logging.debug("[PREPARED] [%s] %s", game.uuid, player)
 		player.prepared = True
 		count = 0
 		for _player in game.players:
@@ -622,10 +659,9 @@ class Server:
 
 		# ACK the change
 		player.toggle_ready()
-		logging.debug("[TOGGLEREADY] [{0!s}] Player:{1!s} {2!s} ready".
-			format(game.uuid, player.name, "is not" if not player.ready else "is"))
-		for _player in game.players:
-			self.send(_player.peer, packets.server.data_gamestate(game))
+		logging.debug("[TOGGLEREADY] [%s] Player:%s %s ready",
+			game.uuid, player.name, "is not" if not player.ready else "is")
+		self.broadcast(game.players, packets.server.data_gamestate(game))
 
 		# start the game after the ACK
 		if game.is_ready():
@@ -652,9 +688,8 @@ class Server:
 		if kickplayer is game.creator:
 			return
 
-		logging.debug("[KICK] [{0!s}] {1!s} got kicked".format(game.uuid, kickplayer.name))
-		for _player in game.players:
-			self.send(_player.peer, packets.server.cmd_kickplayer(kickplayer))
+		logging.debug("[KICK] [%s] %s got kicked", game.uuid, kickplayer.name)
+		self.broadcast(game.players, packets.server.cmd_kickplayer(kickplayer))
 		self.call_callbacks("leavegame", kickplayer)
 
 
@@ -681,34 +716,31 @@ class Server:
 
 
 	def print_statistic(self, file):
-		lines = []
-		lines.append("Games.Total: {0:d}\n".format(len(self.games)))
+		# players that aren't inside a game don't show up in any counter
+		# except the total one, so we only need to look at the games.
 		games_playing = 0
-		for game in self.games:
-			if game.state is Game.State.Running:
-				games_playing += 1
-		lines.append("Games.Playing: {0:d}\n".format(games_playing))
-
-		lines.append("Players.Total: {0:d}\n".format(len(self.players)))
 		players_inlobby = 0
 		players_playing = 0
 		players_oldprotocol = 0
-		for player in self.players.values():
-			if player.game is None:
-				continue
-			if player.game.state is Game.State.Running:
-				players_playing += 1
+		for game in self.games.values():
+			if game.state is Game.State.Running:
+				games_playing += 1
+				players_playing += game.playercnt
 			else:
-				players_inlobby += 1
-			if player.protocol < PROTOCOLS[-1]:
-				players_oldprotocol += 1
+				players_inlobby += game.playercnt
+			players_oldprotocol += sum(1 for player in game.players if player.protocol < PROTOCOLS[-1])
+
+		lines = []
+		lines.append("Games.Total: {0:d}\n".format(len(self.games)))
+		lines.append("Games.Playing: {0:d}\n".format(games_playing))
+		lines.append("Players.Total: {0:d}\n".format(len(self.players)))
 		lines.append("Players.Lobby: {0:d}\n".format(players_inlobby))
 		lines.append("Players.Playing: {0:d}\n".format(players_playing))
 		lines.append("Players.OldProtocol: {0:d}\n".format(players_oldprotocol))
 
 		try:
 			with open(file, "w") as fd:
-				fd.write('\n'.join(lines))
+				fd.write(''.join(lines))
 		except IOError as e:
-			logging.error("[STATISTIC] Unable to open statistic file: {0}".format(e))
+			logging.error("[STATISTIC] Unable to open statistic file: %s", e)
 		return
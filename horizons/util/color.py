@@ -66,6 +66,8 @@ class Color:
 		@params: int (0, 255)
 		"""
 		self.r, self.g, self.b, self.a = r, g, b, a
+		# colors don't change, build the tuple once since it's used for drawing a lot
+		self.rgb_tuple = (r, g, b)
 		query = horizons.globals.db('SELECT name, rowid FROM colors '
 		                            'WHERE red = ? AND green = ? AND blue = ?',
 		                            self.r, self.g, self.b)
@@ -78,7 +80,7 @@ class Color:
 
 	def to_tuple(self):
 		"""Returns color as (r, g, b)-tuple, where each value is between 0 and 255"""
-		return (self.r, self.g, self.b)
+		return self.rgb_tuple
 
 	@property
 	def is_default_color(self):
@@ -56,6 +56,16 @@ class UhDbAccessor(DbReader):
 		name = self.cached_query("SELECT name FROM resource WHERE id = ?", id)[0][0]
 		return T(name)
 
+	def get_res_names(self, ids):
+		"""Returns the translated names for several resource ids using a single query.
+		@param ids: iterable of int resource ids
+		@return: dict {resource id: translated name}"""
+		ids = tuple(sorted(set(ids)))
+		if not ids:
+			return {}
+		sql = "SELECT id, name FROM resource WHERE id IN ({})".format(', '.join('?' * len(ids)))
+		return {res_id: T(name) for res_id, name in self.cached_query(sql, *ids)}
+
 	def get_res_inventory_display(self, id):
 		sql = "SELECT shown_in_inventory FROM resource WHERE id = ?"
 		return self.cached_query(sql, id)[0][0]
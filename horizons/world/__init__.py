@@ -96,6 +96,8 @@ class World(BuildingOwner, WorldObject):
 		self.ground_units = []
 
 		self.islands = []
+		# increased whenever a settlement is added, allows cheap checks for changes
+		self.settlements_version = 0
 
 		super(World, self).__init__(worldid=GAME.WORLD_WORLDID)
 
@@ -401,8 +401,7 @@ class BuildableLine(Buildable):
 		#TODO duplicates recalculation code in world.building.path
 		for x, y in path:
 			action = ''
-			for action_char, (xoff, yoff) in \
-			    sorted(BUILDINGS.ACTION.action_offset_dict.items()): # order is important here
+			for action_char, (xoff, yoff) in BUILDINGS.ACTION.action_offsets: # order is important here
 				if action_char in 'abcd' and (xoff + x, yoff + y) in path:
 					action += action_char
 			if action == '':
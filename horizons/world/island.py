@@ -222,6 +222,7 @@ class Island(BuildingOwner, WorldObject):
 		@param load: whether it has been called during load"""
 		if settlement not in self.settlements:
 			self.settlements.append(settlement)
+			self.session.world.settlements_version += 1
 		self.assign_settlement(position, radius, settlement)
 		self.session.scenario_eventhandler.check_events(CONDITIONS.settlements_num_greater)
 		return settlement
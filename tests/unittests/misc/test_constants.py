@@ -0,0 +1,142 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import tempfile
+import zlib
+from pathlib import Path
+from unittest import TestCase, mock
+
+from horizons.constants import GAME_SPEED, _find_git_tag, _read_git_head, get_git_version
+
+
+class TestGameSpeed(TestCase):
+
+	def test_tick_rates(self):
+		factors = (0.5, 1, 2, 3, 4, 6, 8, 11, 20)
+		expected = tuple(int(i * GAME_SPEED.TICKS_PER_SECOND) for i in factors)
+		self.assertEqual(GAME_SPEED.TICK_RATES, expected)
+
+
+COMMIT = 'c' * 40
+OTHER_COMMIT = 'd' * 40
+TAG_OBJECT = 'a' * 40
+
+
+class TestGitVersion(TestCase):
+	"""
+	Reads the version out of a hand made .git directory.
+	"""
+	def setUp(self):
+		tempdir = tempfile.TemporaryDirectory()
+		self.addCleanup(tempdir.cleanup)
+		self.git_dir = Path(tempdir.name, '.git')
+		Path(self.git_dir, 'refs', 'heads').mkdir(parents=True)
+		Path(self.git_dir, 'refs', 'tags').mkdir()
+		self.write('HEAD', 'ref: refs/heads/master')
+
+	def write(self, path, content):
+		with Path(self.git_dir, path).open('w') as f:
+			f.write(content + '\n')
+
+	def write_tag_object(self, sha, target):
+		object_dir = Path(self.git_dir, 'objects', sha[:2])
+		object_dir.mkdir(parents=True)
+		body = 'object {}\ntype commit\ntag 2018.1\n'.format(target).encode('ascii')
+		with Path(object_dir, sha[2:]).open('wb') as f:
+			f.write(zlib.compress(b'tag ' + str(len(body)).encode('ascii') + b'\0' + body))
+
+	def test_loose_head(self):
+		self.write('refs/heads/master', COMMIT)
+		self.assertEqual(_read_git_head(self.git_dir), COMMIT)
+
+	def test_packed_head(self):
+		self.write('packed-refs', '# pack-refs with: peeled fully-peeled sorted\n'
+		                          '{} refs/heads/master'.format(COMMIT))
+		self.assertEqual(_read_git_head(self.git_dir), COMMIT)
+
+	def test_detached_head(self):
+		self.write('HEAD', COMMIT)
+		self.assertEqual(_read_git_head(self.git_dir), COMMIT)
+
+	def test_missing_head(self):
+		self.assertIsNone(_read_git_head(self.git_dir))
+
+	def test_loose_lightweight_tag(self):
+		self.write('refs/tags/2017.3', COMMIT)
+		self.write('refs/tags/latest', COMMIT)
+		self.assertEqual(_find_git_tag(self.git_dir, COMMIT), '2017.3')
+		self.assertIsNone(_find_git_tag(self.git_dir, OTHER_COMMIT))
+
+	def test_loose_annotated_tag(self):
+		self.write('refs/tags/2018.1', TAG_OBJECT)
+		self.write_tag_object(TAG_OBJECT, COMMIT)
+		self.assertEqual(_find_git_tag(self.git_dir, COMMIT), '2018.1')
+		self.assertIsNone(_find_git_tag(self.git_dir, OTHER_COMMIT))
+
+	def test_packed_annotated_tag(self):
+		self.write('packed-refs', '# pack-refs with: peeled fully-peeled sorted\n'
+		                          '{} refs/tags/2018.1\n'
+		                          '^{}\n'
+		                          '{} refs/tags/2017.3'.format(TAG_OBJECT, COMMIT, OTHER_COMMIT))
+		self.assertEqual(_find_git_tag(self.git_dir, COMMIT), '2018.1')
+		self.assertEqual(_find_git_tag(self.git_dir, OTHER_COMMIT), '2017.3')
+
+	def test_unpeeled_packed_tag(self):
+		# without the peeled trait a packed tag might be annotated
+		self.write('packed-refs', '{} refs/tags/2018.1'.format(TAG_OBJECT))
+		self.assertIsNone(_find_git_tag(self.git_dir, COMMIT))
+		self.write_tag_object(TAG_OBJECT, COMMIT)
+		self.assertEqual(_find_git_tag(self.git_dir, COMMIT), '2018.1')
+
+	def test_several_tags(self):
+		# git describe decides which one to use
+		self.write('refs/tags/2017.3', COMMIT)
+		self.write('refs/tags/2018.1', TAG_OBJECT)
+		self.write_tag_object(TAG_OBJECT, COMMIT)
+		self.assertIsNone(_find_git_tag(self.git_dir, COMMIT))
+
+	def test_loose_overrides_packed(self):
+		self.write('packed-refs', '# pack-refs with: peeled fully-peeled sorted\n'
+		                          '{} refs/tags/2017.3'.format(OTHER_COMMIT))
+		self.write('refs/tags/2017.3', COMMIT)
+		self.assertEqual(_find_git_tag(self.git_dir, COMMIT), '2017.3')
+		self.assertIsNone(_find_git_tag(self.git_dir, OTHER_COMMIT))
+
+	def get_git_version(self, describe):
+		with mock.patch('run_uh.get_content_dir_parent_path', return_value=str(self.git_dir.parent)), \
+		     mock.patch('subprocess.check_output', return_value=describe + '\n') as check_output:
+			return get_git_version(), check_output.called
+
+	def test_version_on_tag(self):
+		self.write('refs/heads/master', COMMIT)
+		self.write('refs/tags/2017.3', COMMIT)
+		self.assertEqual(self.get_git_version('2017.3'), ('2017.3', False))
+
+	def test_version_after_tag(self):
+		self.write('refs/heads/master', COMMIT)
+		self.write('refs/tags/2017.3', OTHER_COMMIT)
+		self.assertEqual(self.get_git_version('2017.3-1-gccccccc'), ('2017.3-1-gccccccc', True))
+
+	def test_version_several_tags(self):
+		self.write('refs/heads/master', COMMIT)
+		self.write('refs/tags/2017.3', COMMIT)
+		self.write('refs/tags/2017.4', COMMIT)
+		self.assertEqual(self.get_git_version('2017.4'), ('2017.4', True))
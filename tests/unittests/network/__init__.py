@@ -0,0 +1,70 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import itertools
+import unittest
+import uuid
+from unittest import mock
+
+from horizons.network.common import Game, Player
+from horizons.network.packets import client
+
+
+class EnetAddress:
+	def __init__(self, host, port):
+		self.host = host
+		self.port = port
+
+
+class EnetPeer:
+	"""Stands in for enet.Peer, the tests don't open any connections."""
+	ports = itertools.count(10000)
+
+	def __init__(self):
+		self.address = EnetAddress('127.0.0.1', next(self.ports))
+		self.state = None
+
+
+class NetworkTestCase(unittest.TestCase):
+	"""
+	Creates players for fake enet peers.
+	"""
+	def setUp(self):
+		patcher = mock.patch('horizons.network.common.enet', Peer=EnetPeer, Address=EnetAddress)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def create_player(self, protocol=1):
+		return Player(EnetPeer(), uuid.uuid4().hex, protocol)
+
+	def create_game(self, creator, name='creator', color=1, maxplayers=4):
+		packet = client.cmd_creategame('2017.3', uuid.uuid4().hex, name, color,
+		                               'Game', 'map', maxplayers)
+		return Game(packet, creator)
+
+	def join_packet(self, game, name, color):
+		return client.cmd_joingame(game.uuid, '2017.3', uuid.uuid4().hex, name, color)
+
+	def assertPlayerSetsMatch(self, game):
+		"""Checks the player lookup sets of the game against its players."""
+		self.assertEqual(game.player_names, {p.name for p in game.players})
+		self.assertEqual(game.player_colors, {p.color for p in game.players})
+		self.assertEqual(game.player_clientids, {p.clientid for p in game.players})
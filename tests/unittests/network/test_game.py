@@ -0,0 +1,128 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from tests.unittests.network import NetworkTestCase
+
+
+class TestGamePlayers(NetworkTestCase):
+
+	def setUp(self):
+		super(TestGamePlayers, self).setUp()
+		self.creator = self.create_player()
+		self.game = self.create_game(self.creator)
+
+	def test_create(self):
+		self.assertEqual(self.game.players, [self.creator])
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_add_player(self):
+		player = self.create_player()
+		self.game.add_player(player, self.join_packet(self.game, 'joined', 2))
+		self.assertIs(player.game, self.game)
+		self.assertEqual(self.game.player_names, {'creator', 'joined'})
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_remove_player(self):
+		player = self.create_player()
+		self.game.add_player(player, self.join_packet(self.game, 'joined', 2))
+		self.assertIs(self.game.remove_player(player), player)
+		self.assertIsNone(player.game)
+		self.assertEqual(self.game.player_colors, {1})
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_remove_unknown_player(self):
+		player = self.create_player()
+		self.assertIsNone(self.game.remove_player(player))
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_change_player_name(self):
+		self.game.change_player_name(self.creator, 'renamed')
+		self.assertEqual(self.creator.name, 'renamed')
+		self.assertNotIn('creator', self.game.player_names)
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_change_player_color(self):
+		self.game.change_player_color(self.creator, 3)
+		self.assertEqual(self.creator.color, 3)
+		self.assertEqual(self.game.player_colors, {3})
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_clear(self):
+		player = self.create_player()
+		self.game.add_player(player, self.join_packet(self.game, 'joined', 2))
+		self.game.clear()
+		self.assertIsNone(self.creator.game)
+		self.assertIsNone(player.game)
+		self.assertEqual(self.game.player_names, set())
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_get_free_color(self):
+		self.assertEqual(self.game.get_free_color(), 2)
+		player = self.create_player()
+		self.game.add_player(player, self.join_packet(self.game, 'joined', 2))
+		self.assertEqual(self.game.get_free_color(), 3)
+		self.game.change_player_color(self.creator, 4)
+		self.assertEqual(self.game.get_free_color(), 1)
+
+	def test_server_only_attributes_are_not_pickled(self):
+		state = self.game.__getstate__()
+		for attribute in self.game.server_only_attributes:
+			self.assertNotIn(attribute, state)
+
+	def test_pickle_client_copy(self):
+		# games unpickled by a client don't have the server only attributes
+		game = object.__new__(type(self.game))
+		game.__dict__.update(self.game.__getstate__())
+		game.creator = self.creator
+		state = game.__getstate__()
+		for attribute in self.game.server_only_attributes:
+			self.assertNotIn(attribute, state)
+
+
+class TestGameOtherPeers(NetworkTestCase):
+
+	def setUp(self):
+		super(TestGameOtherPeers, self).setUp()
+		self.creator = self.create_player()
+		self.game = self.create_game(self.creator)
+		self.player = self.create_player()
+		self.game.add_player(self.player, self.join_packet(self.game, 'joined', 2))
+
+	def test_other_peers(self):
+		self.assertEqual(self.game.get_other_peers(self.creator), (self.player.peer, ))
+		self.assertEqual(self.game.get_other_peers(self.player), (self.creator.peer, ))
+
+	def test_add_player(self):
+		self.game.get_other_peers(self.creator)
+		other = self.create_player()
+		self.game.add_player(other, self.join_packet(self.game, 'other', 3))
+		self.assertEqual(self.game.get_other_peers(self.creator), (self.player.peer, other.peer))
+
+	def test_remove_player(self):
+		self.game.get_other_peers(self.creator)
+		self.game.get_other_peers(self.player)
+		self.game.remove_player(self.player)
+		self.assertEqual(self.game.get_other_peers(self.creator), ())
+
+	def test_clear(self):
+		self.game.get_other_peers(self.creator)
+		self.game.clear()
+		self.assertEqual(self.game.get_other_peers(self.creator), ())
@@ -0,0 +1,69 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import pickle
+import unittest
+
+from horizons.network import packets
+from horizons.network.packets import SafeUnpickler, client, server
+
+
+class TestSafeUnpickler(unittest.TestCase):
+
+	def setUp(self):
+		self.addCleanup(SafeUnpickler.set_mode, client=True)
+
+	def test_whitelisted_packets(self):
+		SafeUnpickler.set_mode(client=False)
+		packet = SafeUnpickler.loads(client.cmd_changename('name').serialize())
+		self.assertIsInstance(packet, client.cmd_changename)
+		self.assertEqual(packet.playername, 'name')
+
+		SafeUnpickler.set_mode(client=True)
+		packet = SafeUnpickler.loads(server.cmd_chatmsg('name', 'hello').serialize())
+		self.assertIsInstance(packet, server.cmd_chatmsg)
+		self.assertEqual(packet.chatmsg, 'hello')
+
+	def test_sets(self):
+		SafeUnpickler.set_mode(client=True)
+		packet = SafeUnpickler.loads(client.game_data({1, 2}).serialize())
+		self.assertEqual(packet.data, {1, 2})
+		packet = SafeUnpickler.loads(client.game_data(frozenset([3])).serialize())
+		self.assertEqual(packet.data, frozenset([3]))
+
+	def test_unsafe_module(self):
+		data = pickle.dumps(unittest.TestCase, packets.PICKLE_PROTOCOL)
+		self.assertRaises(pickle.UnpicklingError, SafeUnpickler.loads, data)
+		# the example from the SafeUnpickler docs
+		self.assertRaises(pickle.UnpicklingError, SafeUnpickler.loads, b"cos\nsystem\n(S'ls ~'\ntR.")
+
+	def test_unsafe_class(self):
+		# the module is whitelisted, but only for a few of its classes
+		data = pickle.dumps(packets.SafeUnpickler, packets.PICKLE_PROTOCOL)
+		self.assertRaises(pickle.UnpicklingError, SafeUnpickler.loads, data)
+		data = pickle.dumps(getattr, packets.PICKLE_PROTOCOL)
+		self.assertRaises(pickle.UnpicklingError, SafeUnpickler.loads, data)
+
+	def test_packets_of_other_side(self):
+		# clients don't accept packets only clients send
+		SafeUnpickler.set_mode(client=True)
+		data = client.cmd_changename('name').serialize()
+		self.assertRaises(pickle.UnpicklingError, SafeUnpickler.loads, data)
@@ -0,0 +1,194 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from unittest import mock
+
+from horizons.network.common import Game
+from horizons.network.packets import client
+from horizons.network.server import Server
+from tests.unittests.network import NetworkTestCase
+
+
+class ServerTestCase(NetworkTestCase):
+	"""
+	Runs the packet handlers of a server that is never started, nothing is sent.
+	"""
+	def setUp(self):
+		super(ServerTestCase, self).setUp()
+		self.server = Server('127.0.0.1', 2002)
+		self.server.send = mock.Mock()
+		self.server.broadcast = mock.Mock()
+		self.server.disconnect = mock.Mock()
+		self.server.error = mock.Mock()
+
+		self.creator = self.create_player()
+		self.server.oncreategame(self.creator, self.create_packet('creator', 1))
+		self.game = self.creator.game
+
+	def create_packet(self, name, color):
+		return client.cmd_creategame('2017.3', self.create_player().sid, name, color,
+		                             'Game', 'map', 4)
+
+	def join(self, name, color):
+		player = self.create_player()
+		self.server.onjoingame(player, self.join_packet(self.game, name, color))
+		return player
+
+
+class TestUniquePlayers(ServerTestCase):
+
+	def test_join(self):
+		player = self.join('joined', 2)
+		self.assertIs(player.game, self.game)
+		self.assertFalse(self.server.error.called)
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_join_name_taken(self):
+		player = self.join('creator', 2)
+		self.assertIsNone(player.game)
+		self.assertEqual(self.server.error.call_count, 1)
+		self.assertEqual(self.game.players, [self.creator])
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_join_color_taken(self):
+		player = self.join('joined', 1)
+		self.assertIsNone(player.game)
+		self.assertEqual(self.server.error.call_count, 1)
+		self.assertEqual(self.game.players, [self.creator])
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_join_free_color(self):
+		player = self.join('joined', None)
+		self.assertEqual(player.color, 2)
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_change_name(self):
+		self.server.onchangename(self.creator, client.cmd_changename('renamed'))
+		self.assertEqual(self.creator.name, 'renamed')
+		self.assertPlayerSetsMatch(self.game)
+
+		# the old name is free again
+		player = self.join('creator', 2)
+		self.assertIs(player.game, self.game)
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_change_name_taken(self):
+		player = self.join('joined', 2)
+		self.server.onchangename(player, client.cmd_changename('creator'))
+		self.assertEqual(player.name, 'joined')
+		self.assertEqual(self.server.error.call_count, 1)
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_change_color(self):
+		self.server.onchangecolor(self.creator, client.cmd_changecolor(3))
+		self.assertEqual(self.creator.color, 3)
+		self.assertPlayerSetsMatch(self.game)
+
+		# the old color is free again
+		player = self.join('joined', 1)
+		self.assertIs(player.game, self.game)
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_change_color_taken(self):
+		player = self.join('joined', 2)
+		self.server.onchangecolor(player, client.cmd_changecolor(1))
+		self.assertEqual(player.color, 2)
+		self.assertEqual(self.server.error.call_count, 1)
+		self.assertPlayerSetsMatch(self.game)
+
+	def test_leave(self):
+		player = self.join('joined', 2)
+		self.server.leavegame(player)
+		self.assertIsNone(player.game)
+		self.assertPlayerSetsMatch(self.game)
+
+		# name and color can be used again
+		player = self.join('joined', 2)
+		self.assertIs(player.game, self.game)
+		self.assertPlayerSetsMatch(self.game)
+
+
+class TestOpenGames(ServerTestCase):
+
+	def assertListed(self, listed):
+		"""Checks the open games index and the game list a client gets."""
+		self.assertEqual(self.game.uuid in self.server.open_games[self.creator.protocol], listed)
+
+		self.server.send.reset_mock()
+		self.server.onlistgames(self.create_player(), client.cmd_listgames('2017.3'))
+		gameslist = self.server.send.call_args[0][1]
+		self.assertEqual([game.uuid for game in gameslist.games], [self.game.uuid] if listed else [])
+
+	def test_create(self):
+		self.assertListed(True)
+
+	def test_other_protocol(self):
+		self.server.onlistgames(self.create_player(protocol=0), client.cmd_listgames('2017.3'))
+		gameslist = self.server.send.call_args[0][1]
+		self.assertEqual(gameslist.games, [])
+
+	def test_preparegame(self):
+		self.server.preparegame(self.game)
+		self.assertListed(False)
+
+	def test_startgame(self):
+		self.server.preparegame(self.game)
+		self.server.startgame(self.game)
+		self.assertListed(False)
+
+	def test_deletegame(self):
+		self.server.deletegame(self.game)
+		self.assertNotIn(self.game.uuid, self.server.games)
+		self.assertListed(False)
+
+	def test_terminategame(self):
+		self.join('joined', 2)
+		self.server.terminategame(self.game, self.creator)
+		self.assertNotIn(self.game.uuid, self.server.games)
+		self.assertListed(False)
+
+	def test_creator_leaves(self):
+		self.join('joined', 2)
+		self.server.leavegame(self.creator)
+		self.assertListed(False)
+
+	def test_reopen(self):
+		self.server.preparegame(self.game)
+		self.server.set_game_state(self.game, Game.State.Open)
+		self.assertListed(True)
+
+	def test_reopen_deleted(self):
+		self.server.deletegame(self.game)
+		self.server.set_game_state(self.game, Game.State.Open)
+		self.assertListed(False)
+
+	def test_creation_order(self):
+		games = [self.game]
+		for name in ('second', 'third'):
+			player = self.create_player()
+			self.server.oncreategame(player, self.create_packet(name, 1))
+			games.append(player.game)
+
+		self.server.preparegame(games[0])
+		self.server.set_game_state(games[0], Game.State.Open)
+		self.server.onlistgames(self.create_player(), client.cmd_listgames('2017.3'))
+		gameslist = self.server.send.call_args[0][1]
+		self.assertEqual([game.uuid for game in gameslist.games], [game.uuid for game in games])
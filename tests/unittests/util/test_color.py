@@ -52,3 +52,8 @@ class TestColor(TestCase):
 	def test_indexing(self):
 		self.assertEqual(Color.get(1), Color(0, 0, 0, 255))
 		self.assertEqual(Color.get('black'), Color(0, 0, 0, 255))
+
+	def test_rgb_tuple(self):
+		color = Color(1, 2, 3, 255)
+		self.assertEqual(color.rgb_tuple, (1, 2, 3))
+		self.assertEqual(color.to_tuple(), color.rgb_tuple)